@@ -2,14 +2,36 @@ import time
 import random
 import hashlib
 import os
-from pymongo import MongoClient
+import heapq
+from itertools import islice
+import sys
+import mmap
+import struct
+import math
+import threading
+import tempfile
+import zlib
+from array import array
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from bisect import bisect_left, bisect_right, insort
+from pymongo import MongoClient, ReturnDocument
 from pymongo.errors import ConnectionFailure
-from flask import Flask, render_template, request, redirect, url_for, flash, session
+from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify
 
 # Flask app setup
 app = Flask(__name__)
 app.secret_key = "your_secret_key_here"
 
+# Range search results are flashed one page at a time
+RANGE_PAGE_SIZE = 50
+
+# Completions cached at every title trie node
+AUTOCOMPLETE_TOP_K = 10
+
+# Catalog writes between trims of the game_changes log
+CHANGE_LOG_PRUNE_INTERVAL = 256
+
 # Simplified B+ Tree Node
 class BPlusTreeNode:
     def __init__(self, leaf=False):
@@ -17,48 +39,75 @@ class BPlusTreeNode:
         self.children = []
         self.leaf = leaf
         self.values = [] if leaf else None
+        self.next = None
+        self.prev = None
+        self.size = 0
 
 class BPlusTree:
+    node_class = BPlusTreeNode
+
     def __init__(self, order=3):
-        self.root = BPlusTreeNode(leaf=True)
+        if order < 3:
+            raise ValueError("B+ Tree order must be at least 3")
+        self.root = self.node_class(leaf=True)
         self.order = order
+        self.last_nodes_visited = 0
 
     def insert(self, key, value):
         root = self.root
         if len(root.keys) >= self.order:
-            new_root = BPlusTreeNode()
+            new_root = self.node_class()
             new_root.children.append(self.root)
+            new_root.size = root.size
             self.split_child(new_root, 0)
             self.root = new_root
         self.insert_non_full(self.root, key, value)
 
     def insert_non_full(self, node, key, value):
+        # Returns True when key was new, so every node on the path can bump its subtree size
         if node.leaf:
-            i = len(node.keys) - 1
-            node.keys.append(0)
-            node.values.append(None)
-            while i >= 0 and node.keys[i] > key:
-                node.keys[i + 1] = node.keys[i]
-                node.values[i + 1] = node.values[i]
-                i -= 1
-            node.keys[i + 1] = key
-            node.values[i + 1] = value
-        else:
-            i = len(node.keys) - 1
-            while i >= 0 and node.keys[i] > key:
-                i -= 1
-            i += 1
+            i = bisect_left(node.keys, key)
+            if i < len(node.keys) and node.keys[i] == key:
+                node.values[i] = value
+                return False
+            node.keys.insert(i, key)
+            node.values.insert(i, value)
+            node.size += 1
+            return True
+        else:
+            i = bisect_right(node.keys, key)
             child = node.children[i]
             if len(child.keys) >= self.order:
                 self.split_child(node, i)
-                if key > node.keys[i]:
+                if key >= node.keys[i]:
                     i += 1
-            self.insert_non_full(node.children[i], key, value)
+            if self.insert_non_full(node.children[i], key, value):
+                node.size += 1
+                return True
+            return False
+
+    def upsert(self, key, value):
+        # Returns True when an existing entry was overwritten, False when key was new
+        if self.replace(key, value):
+            return True
+        self.insert(key, value)
+        return False
+
+    def replace(self, key, value):
+        # Overwrite the value stored for key in place, without touching the tree shape
+        node = self.root
+        while not node.leaf:
+            node = node.children[bisect_right(node.keys, key)]
+        i = bisect_left(node.keys, key)
+        if i < len(node.keys) and node.keys[i] == key:
+            node.values[i] = value
+            return True
+        return False
 
     def split_child(self, parent, index):
         order = self.order
         child = parent.children[index]
-        new_node = BPlusTreeNode(leaf=child.leaf)
+        new_node = self.node_class(leaf=child.leaf)
         
         mid = order // 2
         if child.leaf:
@@ -67,68 +116,2763 @@ class BPlusTree:
             child.keys = child.keys[:mid]
             new_node.values = child.values[mid:]
             child.values = child.values[:mid]
+            new_node.next = child.next
+            if new_node.next is not None:
+                new_node.next.prev = new_node
+            child.next = new_node
+            new_node.prev = child
         else:
             parent.keys.insert(index, child.keys[mid])
             new_node.keys = child.keys[mid + 1:]
             child.keys = child.keys[:mid]
             new_node.children = child.children[mid + 1:]
             child.children = child.children[:mid + 1]
-        
+        self._resize(child)
+        self._resize(new_node)
+
         parent.children.insert(index + 1, new_node)
 
-    def search(self, key):
-        return self._search(self.root, key)
+    @staticmethod
+    def _resize(node):
+        node.size = len(node.keys) if node.leaf else sum(child.size for child in node.children)
 
-    def _search(self, node, key):
-        i = 0
-        while i < len(node.keys) and key > node.keys[i]:
-            i += 1
+    def bulk_load(self, sorted_iterable, fill_factor=0.9):
+        # Build the tree bottom-up from (key, value) pairs already sorted by key
+        if not 0 < fill_factor <= 1:
+            raise ValueError("fill_factor must be in (0, 1]")
+        order = self.order
+        leaf_size = max(order // 2, int(order * fill_factor))
+        leaves = [self.node_class(leaf=True)]
+        last_key = None
+        for key, value in sorted_iterable:
+            if last_key is not None and key <= last_key:
+                raise ValueError("bulk_load requires strictly increasing keys")
+            last_key = key
+            leaf = leaves[-1]
+            if len(leaf.keys) >= leaf_size:
+                leaf.next = self.node_class(leaf=True)
+                leaf.next.prev = leaf
+                leaf = leaf.next
+                leaves.append(leaf)
+            leaf.keys.append(key)
+            leaf.values.append(value)
+
+        # Even out an underfull last leaf with its left neighbour
+        if len(leaves) > 1 and len(leaves[-1].keys) < order // 2:
+            prev, last = leaves[-2], leaves[-1]
+            keys = prev.keys + last.keys
+            values = prev.values + last.values
+            if len(keys) <= order:
+                prev.keys, prev.values, prev.next = keys, values, None
+                leaves.pop()
+            else:
+                half = len(keys) // 2
+                prev.keys, last.keys = keys[:half], keys[half:]
+                prev.values, last.values = values[:half], values[half:]
+
+        for leaf in leaves:
+            leaf.size = len(leaf.keys)
+        level = leaves
+        mins = [leaf.keys[0] if leaf.keys else None for leaf in leaves]
+        fanout = max((order - 1) // 2 + 1, int((order + 1) * fill_factor))
+        while len(level) > 1:
+            parents, parent_mins = [], []
+            start = 0
+            for count in self._pack_sizes(len(level), fanout, (order - 1) // 2 + 1, order + 1):
+                parent = self.node_class()
+                parent.children = level[start:start + count]
+                parent.keys.extend(mins[start + 1:start + count])
+                self._resize(parent)
+                parents.append(parent)
+                parent_mins.append(mins[start])
+                start += count
+            level, mins = parents, parent_mins
+        self.root = level[0]
+
+    @staticmethod
+    def _pack_sizes(total, size, minimum, maximum):
+        sizes = [size] * (total // size)
+        remainder = total % size
+        if remainder:
+            sizes.append(remainder)
+        if len(sizes) > 1 and sizes[-1] < minimum:
+            combined = sizes.pop() + sizes.pop()
+            if combined <= maximum:
+                sizes.append(combined)
+            else:
+                sizes.extend([combined - combined // 2, combined // 2])
+        return sizes
+
+    def delete(self, key):
+        deleted = self._delete(self.root, key)
+        # Collapse a root that merges have left with a single child
+        if not self.root.leaf and not self.root.keys:
+            self.root = self.root.children[0]
+        return deleted
+
+    def _delete(self, node, key):
         if node.leaf:
-            for j in range(len(node.keys)):
-                if node.keys[j] == key:
-                    return node.values[j]
-            return None
-        return self._search(node.children[i], key)
+            i = bisect_left(node.keys, key)
+            if i == len(node.keys) or node.keys[i] != key:
+                return False
+            del node.keys[i]
+            del node.values[i]
+            node.size -= 1
+            return True
+        i = bisect_right(node.keys, key)
+        if not self._delete(node.children[i], key):
+            return False
+        node.size -= 1
+        if len(node.children[i].keys) < self._min_keys(node.children[i]):
+            self._rebalance_child(node, i)
+        return True
+
+    def _min_keys(self, node):
+        return self.order // 2 if node.leaf else (self.order - 1) // 2
+
+    def _rebalance_child(self, parent, index):
+        child = parent.children[index]
+        left = parent.children[index - 1] if index > 0 else None
+        right = parent.children[index + 1] if index + 1 < len(parent.children) else None
+        if left is not None and len(left.keys) > self._min_keys(left):
+            if child.leaf:
+                child.keys.insert(0, left.keys.pop())
+                child.values.insert(0, left.values.pop())
+                parent.keys[index - 1] = child.keys[0]
+                moved = 1
+            else:
+                child.keys.insert(0, parent.keys[index - 1])
+                parent.keys[index - 1] = left.keys.pop()
+                child.children.insert(0, left.children.pop())
+                moved = child.children[0].size
+            child.size += moved
+            left.size -= moved
+        elif right is not None and len(right.keys) > self._min_keys(right):
+            if child.leaf:
+                child.keys.append(right.keys.pop(0))
+                child.values.append(right.values.pop(0))
+                parent.keys[index] = right.keys[0]
+                moved = 1
+            else:
+                child.keys.append(parent.keys[index])
+                parent.keys[index] = right.keys.pop(0)
+                child.children.append(right.children.pop(0))
+                moved = child.children[-1].size
+            child.size += moved
+            right.size -= moved
+        elif left is not None:
+            self._merge_children(parent, index - 1)
+        else:
+            self._merge_children(parent, index)
+
+    def _merge_children(self, parent, index):
+        # Fold children[index + 1] into children[index] and drop their separator
+        left = parent.children[index]
+        right = parent.children[index + 1]
+        if left.leaf:
+            left.keys.extend(right.keys)
+            left.values.extend(right.values)
+            left.next = right.next
+            if left.next is not None:
+                left.next.prev = left
+        else:
+            left.keys.append(parent.keys[index])
+            left.keys.extend(right.keys)
+            left.children.extend(right.children)
+        left.size += right.size
+        del parent.keys[index]
+        del parent.children[index + 1]
+
+    def search(self, key):
+        node = self.root
+        visited = 1
+        while not node.leaf:
+            # Separators equal to key belong to the right subtree
+            node = node.children[bisect_right(node.keys, key)]
+            visited += 1
+        self.last_nodes_visited = visited
+        i = bisect_left(node.keys, key)
+        if i < len(node.keys) and node.keys[i] == key:
+            return node.values[i]
+        return None
+
+    def __len__(self):
+        return self.root.size
+
+    def rank(self, key):
+        # Number of keys strictly smaller than key, i.e. key's 0-based position if present
+        return self._count_below(key, inclusive=False)
+
+    def count_range(self, start_key, end_key):
+        if end_key < start_key:
+            return 0
+        return self._count_below(end_key, inclusive=True) - self._count_below(start_key, inclusive=False)
+
+    def select(self, index):
+        # The (key, value) pair at 0-based position index in key order
+        if not 0 <= index < self.root.size:
+            raise IndexError("select index out of range")
+        node = self.root
+        while not node.leaf:
+            for child in node.children:
+                if index < child.size:
+                    node = child
+                    break
+                index -= child.size
+        return node.keys[index], node.values[index]
+
+    def _count_below(self, key, inclusive):
+        # Whole subtrees left of the descent path are counted from their cached sizes
+        node = self.root
+        count = 0
+        while not node.leaf:
+            i = bisect_right(node.keys, key)
+            for child in node.children[:i]:
+                count += child.size
+            node = node.children[i]
+        return count + (bisect_right if inclusive else bisect_left)(node.keys, key)
+
+    def search_many(self, keys):
+        # Values for keys in the order given, None where missing. Probes run in sorted order and
+        # climb back only as far as the previous path's bounds require, so neighbouring keys
+        # share their descent and their leaf.
+        found = {}
+        stack = []
+        node, upper = self.root, None
+        visited = 1
+        for key in sorted(set(keys)):
+            while upper is not None and key >= upper:
+                node, upper = stack.pop()
+            while not node.leaf:
+                i = bisect_right(node.keys, key)
+                stack.append((node, upper))
+                if i < len(node.keys):
+                    upper = node.keys[i]
+                node = node.children[i]
+                visited += 1
+            i = bisect_left(node.keys, key)
+            if i < len(node.keys) and node.keys[i] == key:
+                found[key] = node.values[i]
+        self.last_nodes_visited = visited
+        return [found.get(key) for key in keys]
 
     def range_search(self, start_key, end_key):
         results = []
-        self._range_search(self.root, start_key, end_key, results)
+        node = self._find_leaf(start_key)
+        i = bisect_left(node.keys, start_key)
+        while node is not None:
+            j = bisect_right(node.keys, end_key, i)
+            results.extend(zip(node.keys[i:j], node.values[i:j]))
+            if j < len(node.keys) or node.next is None:
+                break
+            node = node.next
+            self.last_nodes_visited += 1
+            i = 0
+        return results
+
+    def iter_range(self, start_key, end_key, limit=None, after_key=None, reverse=False):
+        # Lazily yield (key, value) pairs in key order (descending with reverse); after_key resumes
+        # a scan just past that key. Leaves are read only as the caller consumes results.
+        if limit is not None and limit <= 0:
+            return
+        if reverse:
+            yield from self._iter_range_reverse(start_key, end_key, limit, after_key)
+            return
+        if after_key is not None and after_key >= start_key:
+            node = self._find_leaf(after_key, past_key=True)
+            i = bisect_right(node.keys, after_key)
+        else:
+            node = self._find_leaf(start_key)
+            i = bisect_left(node.keys, start_key)
+        remaining = limit
+        while node is not None:
+            j = bisect_right(node.keys, end_key, i)
+            for k in range(i, j):
+                yield node.keys[k], node.values[k]
+                if remaining is not None:
+                    remaining -= 1
+                    if remaining == 0:
+                        return
+            if j < len(node.keys):
+                return
+            node = node.next
+            if node is not None:
+                self.last_nodes_visited += 1
+            i = 0
+
+    def items(self):
+        # Every (key, value) pair in key order, following the leaf chain from the leftmost leaf
+        node = self.root
+        while not node.leaf:
+            node = node.children[0]
+        while node is not None:
+            yield from zip(node.keys, node.values)
+            node = node.next
+
+    def save_snapshot(self, path, change_seq=0):
+        IndexSnapshot.write(path, IndexSnapshot.KIND_BPLUS, change_seq, self.items())
+
+    def load_snapshot(self, path):
+        # Replaces the tree's contents; returns the change sequence the snapshot reflects
+        change_seq, records = IndexSnapshot.read(path, IndexSnapshot.KIND_BPLUS)
+        self.bulk_load(records)
+        return change_seq
+
+    def _iter_range_reverse(self, start_key, end_key, limit, after_key):
+        if after_key is not None and after_key <= end_key:
+            node = self._find_leaf(after_key)
+            j = bisect_left(node.keys, after_key)
+        else:
+            node = self._find_leaf(end_key, past_key=True)
+            j = bisect_right(node.keys, end_key)
+        remaining = limit
+        while node is not None:
+            i = bisect_left(node.keys, start_key, 0, j)
+            for k in range(j - 1, i - 1, -1):
+                yield node.keys[k], node.values[k]
+                if remaining is not None:
+                    remaining -= 1
+                    if remaining == 0:
+                        return
+            if i > 0:
+                return
+            node = node.prev
+            if node is not None:
+                self.last_nodes_visited += 1
+                j = len(node.keys)
+
+    def first(self, n):
+        # The n smallest (key, value) pairs, ascending
+        return self._edge_items(n, 0, 'next')
+
+    def last(self, n):
+        # The n largest (key, value) pairs, largest first
+        return self._edge_items(n, -1, 'prev')
+
+    def _edge_items(self, n, side, direction):
+        node = self.root
+        visited = 1
+        while not node.leaf:
+            node = node.children[side]
+            visited += 1
+        results = []
+        while node is not None and len(results) < n:
+            pairs = zip(node.keys, node.values) if side == 0 else zip(reversed(node.keys), reversed(node.values))
+            results.extend(islice(pairs, n - len(results)))
+            node = getattr(node, direction)
+            if node is not None and len(results) < n:
+                visited += 1
+        self.last_nodes_visited = visited
         return results
 
-    def _range_search(self, node, start_key, end_key, results):
+    def _find_leaf(self, key, past_key=False):
+        # Descend once to the leftmost leaf that can hold key (or, with past_key, anything
+        # greater than key); the leaf chain does the rest
+        bisect_key = bisect_right if past_key else bisect_left
+        node = self.root
+        visited = 1
+        while not node.leaf:
+            node = node.children[bisect_key(node.keys, key)]
+            visited += 1
+        self.last_nodes_visited = visited
+        return node
+
+    def memory_stats(self):
+        # Approximate heap footprint: nodes, key/value containers and the boxed objects they hold
+        nodes = keys = total = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            nodes += 1
+            total += sys.getsizeof(node) + self._container_bytes(node.keys)
+            if hasattr(node, '__dict__'):
+                total += sys.getsizeof(node.__dict__)
+            if node.leaf:
+                keys += len(node.keys)
+                total += self._container_bytes(node.values)
+            else:
+                total += sys.getsizeof(node.children)
+                stack.extend(node.children)
+        total += self._value_store_bytes()
+        return {
+            'nodes': nodes,
+            'keys': keys,
+            'bytes': total,
+            'bytes_per_key': total / keys if keys else 0.0,
+        }
+
+    def _value_store_bytes(self):
+        return 0
+
+    @staticmethod
+    def _container_bytes(container):
+        if isinstance(container, array):
+            return sys.getsizeof(container)
+        return sys.getsizeof(container) + sum(sys.getsizeof(item) for item in container)
+
+# Append-only value list addressed by int slot, reusing the slots of deleted values
+class ValueStoreMixin:
+    def _init_value_store(self):
+        self.value_store = []
+        self._free_slots = []
+
+    def _store(self, value):
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self.value_store[slot] = value
+        else:
+            slot = len(self.value_store)
+            self.value_store.append(value)
+        return slot
+
+    def _release(self, slot):
+        self.value_store[slot] = None
+        self._free_slots.append(slot)
+
+# Compact B+ Tree Node: int64 keys in typed arrays, leaf values are slots in the tree's value store
+class CompactBPlusTreeNode:
+    __slots__ = ('keys', 'children', 'leaf', 'values', 'next', 'prev', 'size')
+
+    def __init__(self, leaf=False):
+        self.keys = array('q')
+        self.children = None if leaf else []
+        self.leaf = leaf
+        self.values = array('q') if leaf else None
+        self.next = None
+        self.prev = None
+        self.size = 0
+
+class CompactBPlusTree(ValueStoreMixin, BPlusTree):
+    node_class = CompactBPlusTreeNode
+
+    def __init__(self, order=3):
+        super().__init__(order)
+        self._init_value_store()
+
+    def insert(self, key, value):
+        self.upsert(key, value)
+
+    def upsert(self, key, value):
+        if self.replace(key, value):
+            return True
+        super().insert(key, self._store(value))
+        return False
+
+    def replace(self, key, value):
+        slot = super().search(key)
+        if slot is None:
+            return False
+        self.value_store[slot] = value
+        return True
+
+    def delete(self, key):
+        slot = super().search(key)
+        if slot is None:
+            return False
+        super().delete(key)
+        self._release(slot)
+        return True
+
+    def search(self, key):
+        slot = super().search(key)
+        return None if slot is None else self.value_store[slot]
+
+    def range_search(self, start_key, end_key):
+        value_store = self.value_store
+        return [(key, value_store[slot]) for key, slot in super().range_search(start_key, end_key)]
+
+    def iter_range(self, start_key, end_key, limit=None, after_key=None, reverse=False):
+        value_store = self.value_store
+        for key, slot in super().iter_range(start_key, end_key, limit, after_key, reverse):
+            yield key, value_store[slot]
+
+    def select(self, index):
+        key, slot = super().select(index)
+        return key, self.value_store[slot]
+
+    def search_many(self, keys):
+        value_store = self.value_store
+        return [None if slot is None else value_store[slot] for slot in super().search_many(keys)]
+
+    def items(self):
+        value_store = self.value_store
+        for key, slot in super().items():
+            yield key, value_store[slot]
+
+    def first(self, n):
+        return [(key, self.value_store[slot]) for key, slot in super().first(n)]
+
+    def last(self, n):
+        return [(key, self.value_store[slot]) for key, slot in super().last(n)]
+
+    def bulk_load(self, sorted_iterable, fill_factor=0.9):
+        self._init_value_store()
+        super().bulk_load(((key, self._store(value)) for key, value in sorted_iterable), fill_factor)
+
+    def _value_store_bytes(self):
+        return self._container_bytes(self.value_store)
+
+# Read paths shared by the id indexes that expose one merged
+# _iter(start_key, end_key, reverse, start_exclusive, end_exclusive) stream of (key, value) pairs
+class OrderedIndexMixin:
+    @staticmethod
+    def _sorted_pairs(sorted_iterable):
+        # bulk_load takes fill_factor only for BPlusTree compatibility; these indexes always pack fully
+        keys, values = [], []
+        for key, value in sorted_iterable:
+            if keys and key <= keys[-1]:
+                raise ValueError("bulk_load requires strictly increasing keys")
+            keys.append(key)
+            values.append(value)
+        return keys, values
+
+    def iter_range(self, start_key, end_key, limit=None, after_key=None, reverse=False):
+        if limit is not None and limit <= 0:
+            return
+        if reverse and after_key is not None and after_key <= end_key:
+            pairs = self._iter(start_key, after_key, reverse=True, end_exclusive=True)
+        elif not reverse and after_key is not None and after_key >= start_key:
+            pairs = self._iter(after_key, end_key, start_exclusive=True)
+        else:
+            pairs = self._iter(start_key, end_key, reverse=reverse)
+        yield from islice(pairs, limit)
+
+    def range_search(self, start_key, end_key):
+        return list(self.iter_range(start_key, end_key))
+
+    def items(self):
+        return self._iter(None, None)
+
+    def first(self, n):
+        return list(islice(self._iter(None, None), n))
+
+    def last(self, n):
+        return list(islice(self._iter(None, None, reverse=True), n))
+
+    def select(self, index):
+        if index >= 0:
+            for pair in islice(self._iter(None, None), index, None):
+                return pair
+        raise IndexError("select index out of range")
+
+    def save_snapshot(self, path, change_seq=0):
+        IndexSnapshot.write(path, IndexSnapshot.KIND_BPLUS, change_seq, self.items())
+
+    def load_snapshot(self, path):
+        change_seq, records = IndexSnapshot.read(path, IndexSnapshot.KIND_BPLUS)
+        self.bulk_load(records)
+        return change_seq
+
+# Disk-resident B+ Tree: fixed-size pages in an mmap-ed file, cached through an LRU buffer pool
+class PagedBPlusTreeNode:
+    __slots__ = ('page_id', 'leaf', 'keys', 'children', 'counts', 'values', 'next', 'dirty')
+
+    def __init__(self, page_id, leaf=False):
+        self.page_id = page_id
+        self.leaf = leaf
+        self.keys = []
+        # Internal nodes keep the number of keys under each child for order statistics
+        self.children = [] if not leaf else None
+        self.counts = [] if not leaf else None
+        self.values = [] if leaf else None
+        self.next = -1
+        self.dirty = False
+
+    def size(self):
+        return len(self.keys) if self.leaf else sum(self.counts)
+
+class PagedBPlusTree(OrderedIndexMixin):
+    MAGIC = b"GMSBPT"
+    VERSION = 2
+    # Page 0 holds the file header: magic, version, page size, order, root page, page count
+    FILE_HEADER = struct.Struct("<6sHIIqq")
+    # Every node page starts with: leaf flag, key count, next leaf page (-1 for none)
+    PAGE_HEADER = struct.Struct("<BHq")
+    # Titles are stored in extents rounded up to this many bytes, so a freed extent fits similar titles
+    VALUE_ALIGN = 16
+    # Bytes of titles buffered by bulk_load before they are written to the heap
+    BULK_WRITE_BYTES = 1 << 20
+
+    def __init__(self, path, page_size=4096, pool_pages=1024):
+        if pool_pages < 8:
+            raise ValueError("pool_pages must be at least 8")
+        self.path = path
+        self.pool_pages = pool_pages
+        self._pool = OrderedDict()
+        # The pool reorders on every page access, so reads take the lock too
+        self._lock = threading.RLock()
+        self.hits = self.misses = self.evictions = self.writebacks = 0
+        # Titles live in a heap file beside the page file; leaves keep (offset, length). Freed extents
+        # are tracked per rounded size for this open only, so reopening leaks them until the next bulk_load
+        values_path = path + ".values"
+        self._values = open(values_path, "r+b" if os.path.exists(values_path) else "w+b", buffering=0)
+        self._heap_end = os.fstat(self._values.fileno()).st_size
+        self._free_extents = {}
+        self.free_value_bytes = 0
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self._file = open(path, "r+b" if exists else "w+b")
+        if exists:
+            magic, version, page_size, order, root_id, page_count = self.FILE_HEADER.unpack(
+                self._file.read(self.FILE_HEADER.size))
+            if magic != self.MAGIC or version != self.VERSION:
+                raise ValueError(f"{path} is not a paged B+ Tree file")
+            self.page_size, self.order = page_size, order
+            self.root_id, self.page_count = root_id, page_count
+            self._mmap = mmap.mmap(self._file.fileno(), 0)
+        else:
+            self.page_size = page_size
+            # Leaves spend 8 bytes per key plus 12 per value reference, internal nodes 8 per key and
+            # 16 per child (page and subtree count)
+            leaf_order = (page_size - self.PAGE_HEADER.size) // 20
+            internal_order = (page_size - self.PAGE_HEADER.size - 16) // 24
+            self.order = min(leaf_order, internal_order)
+            if self.order < 3:
+                raise ValueError("page_size is too small for a B+ Tree node")
+            self._file.truncate(page_size * 64)
+            self._mmap = mmap.mmap(self._file.fileno(), 0)
+            self._reset_pages()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _reset_pages(self):
+        self._pool.clear()
+        self.page_count = 1
+        self.root_id = self._allocate(leaf=True).page_id
+        self._write_header()
+
+    def _write_header(self):
+        self.FILE_HEADER.pack_into(self._mmap, 0, self.MAGIC, self.VERSION, self.page_size,
+                                   self.order, self.root_id, self.page_count)
+
+    def _allocate(self, leaf):
+        page_id = self.page_count
+        self.page_count += 1
+        if self.page_count * self.page_size > len(self._mmap):
+            self._mmap.resize(len(self._mmap) * 2)
+        node = PagedBPlusTreeNode(page_id, leaf)
+        self._mark_dirty(node)
+        return node
+
+    def _node(self, page_id):
+        node = self._pool.get(page_id)
+        if node is not None:
+            self._pool.move_to_end(page_id)
+            self.hits += 1
+            return node
+        self.misses += 1
+        node = self._decode(page_id)
+        self._pool[page_id] = node
+        self._evict()
+        return node
+
+    def _mark_dirty(self, node):
+        # Re-admits a node the pool dropped while the caller still held it
+        node.dirty = True
+        self._pool[node.page_id] = node
+        self._pool.move_to_end(node.page_id)
+        self._evict()
+
+    def _evict(self):
+        while len(self._pool) > self.pool_pages:
+            _, victim = self._pool.popitem(last=False)
+            self.evictions += 1
+            if victim.dirty:
+                self._encode(victim)
+
+    def _decode(self, page_id):
+        offset = page_id * self.page_size
+        leaf, count, next_page = self.PAGE_HEADER.unpack_from(self._mmap, offset)
+        node = PagedBPlusTreeNode(page_id, bool(leaf))
+        node.next = next_page
+        offset += self.PAGE_HEADER.size
+        node.keys = list(struct.unpack_from(f"<{count}q", self._mmap, offset))
+        offset += 8 * count
         if node.leaf:
-            for i in range(len(node.keys)):
-                if start_key <= node.keys[i] <= end_key:
-                    results.append((node.keys[i], node.values[i]))
+            refs = struct.unpack_from(f"<{count}q{count}I", self._mmap, offset)
+            node.values = list(zip(refs[:count], refs[count:]))
+        else:
+            refs = struct.unpack_from(f"<{count + 1}q{count + 1}q", self._mmap, offset)
+            node.children, node.counts = list(refs[:count + 1]), list(refs[count + 1:])
+        return node
+
+    def _encode(self, node):
+        offset = node.page_id * self.page_size
+        count = len(node.keys)
+        self.PAGE_HEADER.pack_into(self._mmap, offset, node.leaf, count, node.next)
+        offset += self.PAGE_HEADER.size
+        struct.pack_into(f"<{count}q", self._mmap, offset, *node.keys)
+        offset += 8 * count
+        if node.leaf:
+            struct.pack_into(f"<{count}q{count}I", self._mmap, offset,
+                             *[ref[0] for ref in node.values], *[ref[1] for ref in node.values])
+        else:
+            struct.pack_into(f"<{count + 1}q{count + 1}q", self._mmap, offset, *node.children, *node.counts)
+        node.dirty = False
+        self.writebacks += 1
+
+    def _extent(self, length):
+        return max(1, -(-length // self.VALUE_ALIGN)) * self.VALUE_ALIGN
+
+    def _store_value(self, value):
+        data = value.encode("utf-8")
+        extent = self._extent(len(data))
+        free = self._free_extents.get(extent)
+        if free:
+            offset = free.pop()
+            self.free_value_bytes -= extent
+        else:
+            offset, self._heap_end = self._heap_end, self._heap_end + extent
+        os.pwrite(self._values.fileno(), data, offset)
+        return offset, len(data)
+
+    def _replace_value(self, ref, value):
+        # A title that still fits its extent is overwritten in place
+        data = value.encode("utf-8")
+        if self._extent(len(data)) == self._extent(ref[1]):
+            os.pwrite(self._values.fileno(), data, ref[0])
+            return ref[0], len(data)
+        self._free_value(ref)
+        return self._store_value(value)
+
+    def _free_value(self, ref):
+        extent = self._extent(ref[1])
+        self._free_extents.setdefault(extent, []).append(ref[0])
+        self.free_value_bytes += extent
+
+    def _load_value(self, ref):
+        return os.pread(self._values.fileno(), ref[1], ref[0]).decode("utf-8")
+
+    def _find_leaf(self, key):
+        node = self._node(self.root_id)
+        while not node.leaf:
+            node = self._node(node.children[bisect_right(node.keys, key)])
+        return node
+
+    def insert(self, key, value):
+        self.upsert(key, value)
+
+    def upsert(self, key, value):
+        # Same top-down pre-emptive splitting as BPlusTree; an existing key is overwritten
+        with self._lock:
+            leaf = self._find_leaf(key)
+            i = bisect_left(leaf.keys, key)
+            if i < len(leaf.keys) and leaf.keys[i] == key:
+                leaf.values[i] = self._replace_value(leaf.values[i], value)
+                self._mark_dirty(leaf)
+                return True
+            node = self._node(self.root_id)
+            if len(node.keys) >= self.order:
+                new_root = self._allocate(leaf=False)
+                new_root.children.append(node.page_id)
+                new_root.counts.append(node.size())
+                self._split_child(new_root, 0, node)
+                self.root_id = new_root.page_id
+                node = new_root
+            while not node.leaf:
+                i = bisect_right(node.keys, key)
+                child = self._node(node.children[i])
+                if len(child.keys) >= self.order:
+                    self._split_child(node, i, child)
+                    if key >= node.keys[i]:
+                        i += 1
+                    child = self._node(node.children[i])
+                node.counts[i] += 1
+                self._mark_dirty(node)
+                node = child
+            i = bisect_left(node.keys, key)
+            node.keys.insert(i, key)
+            node.values.insert(i, self._store_value(value))
+            self._mark_dirty(node)
+            return False
+
+    def _split_child(self, parent, index, child):
+        new_node = self._allocate(leaf=child.leaf)
+        mid = self.order // 2
+        parent.keys.insert(index, child.keys[mid])
+        if child.leaf:
+            new_node.keys, child.keys = child.keys[mid:], child.keys[:mid]
+            new_node.values, child.values = child.values[mid:], child.values[:mid]
+            new_node.next, child.next = child.next, new_node.page_id
+        else:
+            new_node.keys, child.keys = child.keys[mid + 1:], child.keys[:mid]
+            new_node.children, child.children = child.children[mid + 1:], child.children[:mid + 1]
+            new_node.counts, child.counts = child.counts[mid + 1:], child.counts[:mid + 1]
+        parent.children.insert(index + 1, new_node.page_id)
+        parent.counts[index] = child.size()
+        parent.counts.insert(index + 1, new_node.size())
+        for node in (parent, child, new_node):
+            self._mark_dirty(node)
+
+    def delete(self, key):
+        # Underfull pages are left in place rather than merged; empty leaves stay in the chain and
+        # their zero counts let order statistics skip them
+        with self._lock:
+            if self.search(key) is None:
+                return False
+            node = self._node(self.root_id)
+            while not node.leaf:
+                i = bisect_right(node.keys, key)
+                node.counts[i] -= 1
+                self._mark_dirty(node)
+                node = self._node(node.children[i])
+            i = bisect_left(node.keys, key)
+            del node.keys[i]
+            self._free_value(node.values.pop(i))
+            self._mark_dirty(node)
+            return True
+
+    def search(self, key):
+        with self._lock:
+            node = self._find_leaf(key)
+            i = bisect_left(node.keys, key)
+            if i < len(node.keys) and node.keys[i] == key:
+                return self._load_value(node.values[i])
+            return None
+
+    def search_many(self, keys):
+        return [self.search(key) for key in keys]
+
+    def bulk_load(self, sorted_iterable, fill_factor=0.9):
+        # Rewrite the page file and value heap from scratch, streaming leaves out left to right
+        if not 0 < fill_factor <= 1:
+            raise ValueError("fill_factor must be in (0, 1]")
+        with self._lock:
+            self._values.truncate(0)
+            self._mmap.resize(self.page_size * 64)
+            self._heap_end = 0
+            self._free_extents = {}
+            self.free_value_bytes = 0
+            self._reset_pages()
+            order = self.order
+            leaf_size = max(order // 2, int(order * fill_factor))
+            leaf = self._node(self.root_id)
+            # (first key, page, key count) for every node of the level being built
+            level = [[None, leaf.page_id, 0]]
+            heap, heap_start = bytearray(), 0
+            last_key = None
+            for key, value in sorted_iterable:
+                if last_key is not None and key <= last_key:
+                    raise ValueError("bulk_load requires strictly increasing keys")
+                last_key = key
+                if len(leaf.keys) >= leaf_size:
+                    new_leaf = self._allocate(leaf=True)
+                    leaf.next = new_leaf.page_id
+                    self._mark_dirty(leaf)
+                    leaf = new_leaf
+                    level.append([key, leaf.page_id, 0])
+                data = value.encode("utf-8")
+                leaf.keys.append(key)
+                leaf.values.append((heap_start + len(heap), len(data)))
+                heap += data.ljust(self._extent(len(data)), b"\0")
+                if len(heap) >= self.BULK_WRITE_BYTES:
+                    os.pwrite(self._values.fileno(), heap, heap_start)
+                    heap_start += len(heap)
+                    heap = bytearray()
+                level[-1][2] += 1
+                self._mark_dirty(leaf)
+            os.pwrite(self._values.fileno(), heap, heap_start)
+            self._heap_end = heap_start + len(heap)
+            fanout = max((order - 1) // 2 + 1, int((order + 1) * fill_factor))
+            while len(level) > 1:
+                parents, start = [], 0
+                for count in BPlusTree._pack_sizes(len(level), fanout, (order - 1) // 2 + 1, order + 1):
+                    group = level[start:start + count]
+                    parent = self._allocate(leaf=False)
+                    parent.keys = [entry[0] for entry in group[1:]]
+                    parent.children = [entry[1] for entry in group]
+                    parent.counts = [entry[2] for entry in group]
+                    self._mark_dirty(parent)
+                    parents.append([group[0][0], parent.page_id, sum(parent.counts)])
+                    start += count
+                level = parents
+            self.root_id = level[0][1]
+            self._write_header()
+
+    # Order statistics descend by the per-child counts in internal pages
+    def __len__(self):
+        with self._lock:
+            return self._node(self.root_id).size()
+
+    def _count_below(self, key, inclusive):
+        node = self._node(self.root_id)
+        total = 0
+        while not node.leaf:
+            i = bisect_right(node.keys, key)
+            total += sum(node.counts[:i])
+            node = self._node(node.children[i])
+        return total + (bisect_right if inclusive else bisect_left)(node.keys, key)
+
+    def _leaf_at(self, index):
+        # (leaf, position) of the index-th key, or (None, -1) past the end
+        node = self._node(self.root_id)
+        while not node.leaf:
+            for child, count in zip(node.children, node.counts):
+                if index < count:
+                    break
+                index -= count
+            else:
+                return None, -1
+            node = self._node(child)
+        return (node, index) if index < len(node.keys) else (None, -1)
+
+    def rank(self, key):
+        with self._lock:
+            return self._count_below(key, False)
+
+    def count_range(self, start_key, end_key):
+        if start_key > end_key:
+            return 0
+        with self._lock:
+            return self._count_below(end_key, True) - self._count_below(start_key, False)
+
+    def select(self, index):
+        with self._lock:
+            leaf, i = self._leaf_at(index) if index >= 0 else (None, -1)
+            if leaf is None:
+                raise IndexError("select index out of range")
+            return leaf.keys[i], self._load_value(leaf.values[i])
+
+    def _iter(self, start_key, end_key, reverse=False, start_exclusive=False, end_exclusive=False):
+        # One leaf's worth of pairs per batch, each read under the lock and located afresh by rank from the
+        # last key yielded, so a split or eviction between batches cannot skip or repeat keys
+        while True:
+            with self._lock:
+                if reverse:
+                    index = (len(self) if end_key is None else self._count_below(end_key, not end_exclusive)) - 1
+                    leaf, i = self._leaf_at(index) if index >= 0 else (None, -1)
+                    if leaf is None:
+                        return
+                    lo = 0
+                    if start_key is not None:
+                        lo = (bisect_right if start_exclusive else bisect_left)(leaf.keys, start_key, 0, i + 1)
+                    positions = range(i, lo - 1, -1)
+                    done = lo > 0
+                else:
+                    index = 0 if start_key is None else self._count_below(start_key, start_exclusive)
+                    leaf, i = self._leaf_at(index)
+                    if leaf is None:
+                        return
+                    hi = len(leaf.keys)
+                    if end_key is not None:
+                        hi = (bisect_left if end_exclusive else bisect_right)(leaf.keys, end_key, i)
+                    positions = range(i, hi)
+                    done = hi < len(leaf.keys)
+                batch = [(leaf.keys[k], self._load_value(leaf.values[k])) for k in positions]
+            yield from batch
+            if done or not batch:
+                return
+            if reverse:
+                end_key, end_exclusive = batch[-1][0], True
+            else:
+                start_key, start_exclusive = batch[-1][0], True
+
+    def buffer_stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'writebacks': self.writebacks,
+                'cached_pages': len(self._pool),
+                'pool_pages': self.pool_pages,
+                'pages': self.page_count,
+                'value_bytes': self._heap_end,
+                'free_value_bytes': self.free_value_bytes,
+            }
+
+    def flush(self):
+        with self._lock:
+            for node in self._pool.values():
+                if node.dirty:
+                    self._encode(node)
+            self._write_header()
+            self._mmap.flush()
+
+    def close(self):
+        self.flush()
+        self._mmap.close()
+        self._file.close()
+        self._values.close()
+
+# LSM index: writes land in a sorted memtable that is frozen into immutable sorted runs,
+# which a background thread merges in size tiers
+class SortedRun:
+    __slots__ = ('keys', 'values')
+
+    def __init__(self, keys, values):
+        self.keys = keys
+        self.values = values
+
+class LSMIndex(OrderedIndexMixin):
+    # Marks a deleted key until a merge into the oldest run can drop it
+    TOMBSTONE = object()
+
+    def __init__(self, memtable_limit=4096, merge_fanout=4, background_merge=True):
+        self.memtable_limit = memtable_limit
+        self.merge_fanout = merge_fanout
+        self.background_merge = background_merge
+        # (dict, sorted keys), replaced whole on a flush; readers take it before _runs, and a flush
+        # publishes the frozen run before the empty memtable, so a key is always in one or the other
+        self._memtable = ({}, [])
+        # Newest first; replaced rather than mutated so readers can iterate a stable list
+        self._runs = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._merge_thread = None
+
+    def _insert_locked(self, key, value):
+        mem, mem_keys = self._memtable
+        # The dict entry goes in first so a reader never finds a key in mem_keys without its value
+        existed = key in mem
+        mem[key] = value
+        if not existed:
+            insort(mem_keys, key)
+        if len(mem) >= self.memtable_limit:
+            self._flush_memtable_locked()
+
+    def insert(self, key, value):
+        with self._write_lock:
+            self._insert_locked(key, value)
+
+    def upsert(self, key, value):
+        with self._write_lock:
+            existed = self.search(key) is not None
+            self._insert_locked(key, value)
+            return existed
+
+    def replace(self, key, value):
+        with self._write_lock:
+            if self.search(key) is None:
+                return False
+            self._insert_locked(key, value)
+            return True
+
+    def delete(self, key):
+        with self._write_lock:
+            if self.search(key) is None:
+                return False
+            self._insert_locked(key, self.TOMBSTONE)
+            return True
+
+    def search(self, key):
+        value = self._memtable[0].get(key)
+        if value is None:
+            for run in self._runs:
+                i = bisect_left(run.keys, key)
+                if i < len(run.keys) and run.keys[i] == key:
+                    value = run.values[i]
+                    break
+        return None if value is self.TOMBSTONE else value
+
+    def search_many(self, keys):
+        return [self.search(key) for key in keys]
+
+    def bulk_load(self, sorted_iterable, fill_factor=None):
+        self.wait_for_merges()
+        keys, values = self._sorted_pairs(sorted_iterable)
+        with self._write_lock:
+            self._runs = [SortedRun(keys, values)] if keys else []
+            self._memtable = ({}, [])
+
+    def _flush_memtable_locked(self):
+        mem, mem_keys = self._memtable
+        run = SortedRun(mem_keys, [mem[key] for key in mem_keys])
+        with self._lock:
+            self._runs = [run] + self._runs
+        self._memtable = ({}, [])
+        self._schedule_merge()
+
+    def _level(self, run):
+        level, size = 0, self.memtable_limit
+        while len(run.keys) > size:
+            size *= self.merge_fanout
+            level += 1
+        return level
+
+    def _mergeable_group(self):
+        # The merge_fanout oldest runs of the first size tier that has filled up
+        runs = self._runs
+        start = 0
+        while start < len(runs):
+            level = self._level(runs[start])
+            end = start + 1
+            while end < len(runs) and self._level(runs[end]) == level:
+                end += 1
+            if end - start >= self.merge_fanout:
+                return runs[end - self.merge_fanout:end]
+            start = end
+        return None
+
+    def _schedule_merge(self):
+        with self._lock:
+            if self._merge_thread is not None:
+                return
+            group = self._start_merge_locked()
+        if group is not None:
+            self._merge(group)
+
+    def _start_merge_locked(self):
+        # Starts a background merge if one is due; returns the group to merge inline otherwise
+        group = self._mergeable_group()
+        if group is None or not self.background_merge:
+            return group
+        self._merge_thread = threading.Thread(target=self._merge, args=(group,), daemon=True)
+        self._merge_thread.start()
+        return None
+
+    def _merge(self, group):
+        drop_tombstones = group[-1] is self._runs[-1]
+        keys, values = [], []
+        for key, value in self._merge_streams([self._run_stream(run, priority, None, None, False, False, False)
+                                               for priority, run in enumerate(group)], False):
+            if value is self.TOMBSTONE and drop_tombstones:
+                continue
+            keys.append(key)
+            values.append(value)
+        with self._lock:
+            runs = self._runs
+            start = next(i for i, run in enumerate(runs) if run is group[0])
+            self._runs = runs[:start] + [SortedRun(keys, values)] + runs[start + len(group):]
+            if not self.background_merge:
+                group = self._mergeable_group()
+            else:
+                # Cascade into the next level without a window where no merge looks pending
+                self._merge_thread = None
+                group = self._start_merge_locked()
+        if group is not None:
+            self._merge(group)
+
+    def wait_for_merges(self):
+        while True:
+            with self._lock:
+                thread = self._merge_thread
+            if thread is None:
+                return
+            thread.join()
+
+    @staticmethod
+    def _run_stream(run, priority, start_key, end_key, start_exclusive, end_exclusive, reverse):
+        keys = run.keys
+        if start_key is None:
+            lo = 0
+        else:
+            lo = (bisect_right if start_exclusive else bisect_left)(keys, start_key)
+        if end_key is None:
+            hi = len(keys)
+        else:
+            hi = (bisect_left if end_exclusive else bisect_right)(keys, end_key)
+        positions = range(hi - 1, lo - 1, -1) if reverse else range(lo, hi)
+        values = run.values
+        for i in positions:
+            yield keys[i], priority, values[i]
+
+    def _merge_streams(self, streams, reverse):
+        # Newest source wins for a key; streams are tagged with their age as the priority
+        if reverse:
+            merged = heapq.merge(*streams, key=lambda entry: (entry[0], -entry[1]), reverse=True)
+        else:
+            merged = heapq.merge(*streams, key=lambda entry: (entry[0], entry[1]))
+        previous = self.TOMBSTONE
+        for key, _, value in merged:
+            if previous is not self.TOMBSTONE and key == previous:
+                continue
+            previous = key
+            yield key, value
+
+    def _iter(self, start_key, end_key, reverse=False, start_exclusive=False, end_exclusive=False):
+        # Copy only the part of the memtable inside the bounds; a memtable only grows, so an unchanged
+        # length means no insert shifted mem_keys between the bisects and the slice
+        mem, mem_keys = self._memtable
+        while True:
+            size = len(mem_keys)
+            lo = 0 if start_key is None else (bisect_right if start_exclusive else bisect_left)(mem_keys, start_key)
+            hi = size if end_key is None else (bisect_left if end_exclusive else bisect_right)(mem_keys, end_key)
+            in_range = mem_keys[lo:hi]
+            if len(mem_keys) == size:
+                break
+        memtable = SortedRun(in_range, None)
+        memtable.values = [mem[key] for key in memtable.keys]
+        sources = [memtable] + self._runs
+        streams = [self._run_stream(run, priority, start_key, end_key, start_exclusive, end_exclusive, reverse)
+                   for priority, run in enumerate(sources)]
+        for key, value in self._merge_streams(streams, reverse):
+            if value is not self.TOMBSTONE:
+                yield key, value
+
+    # Order statistics have no cached counts here and cost a merged scan
+    def __len__(self):
+        return sum(1 for _ in self._iter(None, None))
+
+    def count_range(self, start_key, end_key):
+        return sum(1 for _ in self._iter(start_key, end_key))
+
+    def rank(self, key):
+        return sum(1 for _ in self._iter(None, key, end_exclusive=True))
+
+    def stats(self):
+        return {
+            'memtable': len(self._memtable[0]),
+            'runs': [len(run.keys) for run in self._runs],
+            'merging': self._merge_thread is not None,
+        }
+
+# Read-optimized static index: keys sit in one sorted int64 array with the values alongside, and
+# writes collect in a small delta buffer that is folded into a fresh array once it fills
+class SortedArrayIndex(OrderedIndexMixin):
+    # Marks a deleted key in the delta buffer until the next fold drops it
+    TOMBSTONE = object()
+
+    def __init__(self, delta_limit=256):
+        self.delta_limit = delta_limit
+        # (keys, values, search model) and (delta dict, sorted delta keys) are each replaced whole, base
+        # first, so lock-free readers never pair new keys with old values or a stale model
+        self._base = (array('q'), [], self._build(array('q')))
+        self._pending = ({}, [])
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def _build(self, keys):
+        # Subclasses derive their search model from the key array here
+        return None
+
+    def _position(self, base, key, right=False):
+        return (bisect_right if right else bisect_left)(base[0], key)
+
+    def _base_search(self, base, key):
+        keys = base[0]
+        i = self._position(base, key)
+        if i < len(keys) and keys[i] == key:
+            return base[1][i]
+        return None
+
+    def _publish(self, keys, values):
+        keys = array('q', keys)
+        self._base = (keys, values, self._build(keys))
+        self._pending = ({}, [])
+        self._count = len(values)
+
+    def _fold_delta_locked(self):
+        keys, values = [], []
+        for key, value in self._iter(None, None):
+            keys.append(key)
+            values.append(value)
+        self._publish(keys, values)
+
+    def _write_locked(self, key, value):
+        delta, delta_keys = self._pending
+        if key not in delta:
+            insort(delta_keys, key)
+        delta[key] = value
+        if len(delta) >= self.delta_limit:
+            self._fold_delta_locked()
+
+    def insert(self, key, value):
+        self.upsert(key, value)
+
+    def upsert(self, key, value):
+        with self._lock:
+            existed = self.search(key) is not None
+            if not existed:
+                self._count += 1
+            self._write_locked(key, value)
+            return existed
+
+    def replace(self, key, value):
+        with self._lock:
+            if self.search(key) is None:
+                return False
+            self._write_locked(key, value)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            if self.search(key) is None:
+                return False
+            self._count -= 1
+            self._write_locked(key, self.TOMBSTONE)
+            return True
+
+    def search(self, key):
+        value = self._pending[0].get(key)
+        if value is None:
+            return self._base_search(self._base, key)
+        return None if value is self.TOMBSTONE else value
+
+    def search_many(self, keys):
+        return [self.search(key) for key in keys]
+
+    def bulk_load(self, sorted_iterable, fill_factor=None):
+        keys, values = self._sorted_pairs(sorted_iterable)
+        with self._lock:
+            self._publish(keys, values)
+
+    @staticmethod
+    def _span(size, position, start_key, end_key, start_exclusive, end_exclusive):
+        lo = 0 if start_key is None else position(start_key, start_exclusive)
+        hi = size if end_key is None else position(end_key, not end_exclusive)
+        return lo, hi
+
+    def _iter(self, start_key, end_key, reverse=False, start_exclusive=False, end_exclusive=False):
+        delta, delta_keys = self._pending
+        base = self._base
+        keys, values = base[0], base[1]
+        lo, hi = self._span(len(keys), lambda key, right: self._position(base, key, right),
+                            start_key, end_key, start_exclusive, end_exclusive)
+        positions = range(hi - 1, lo - 1, -1) if reverse else range(lo, hi)
+        if not delta:
+            for i in positions:
+                yield keys[i], values[i]
             return
-        
-        i = 0
-        while i < len(node.keys) and start_key > node.keys[i]:
+        dlo, dhi = self._span(len(delta_keys), lambda key, right: (bisect_right if right else bisect_left)(delta_keys, key),
+                              start_key, end_key, start_exclusive, end_exclusive)
+        in_range = delta_keys[dlo:dhi]
+        if reverse:
+            in_range.reverse()
+        # The delta buffer is newer than the array, so it wins ties
+        streams = [((key, 0, delta.get(key, self.TOMBSTONE)) for key in in_range),
+                   ((keys[i], 1, values[i]) for i in positions)]
+        if reverse:
+            merged = heapq.merge(*streams, key=lambda entry: (entry[0], -entry[1]), reverse=True)
+        else:
+            merged = heapq.merge(*streams, key=lambda entry: (entry[0], entry[1]))
+        previous = None
+        for key, _, value in merged:
+            if key == previous:
+                continue
+            previous = key
+            if value is not self.TOMBSTONE:
+                yield key, value
+
+    # Order statistics index the array directly and correct for the at most delta_limit pending writes
+    def _adjustments(self, base, delta, delta_keys):
+        # (key, +1) for pending inserts of new keys, (key, -1) for pending deletes of array keys
+        adjustments = []
+        for key in list(delta_keys):
+            in_base = self._base_search(base, key) is not None
+            value = delta.get(key, self.TOMBSTONE)
+            if value is self.TOMBSTONE and in_base:
+                adjustments.append((key, -1))
+            elif value is not self.TOMBSTONE and not in_base:
+                adjustments.append((key, 1))
+        return adjustments
+
+    def _merged_rank(self, key, right=False):
+        delta, delta_keys = self._pending
+        base = self._base
+        rank = self._position(base, key, right)
+        for adjusted_key, change in self._adjustments(base, delta, delta_keys):
+            if adjusted_key < key or (right and adjusted_key == key):
+                rank += change
+        return rank
+
+    def __len__(self):
+        return self._count
+
+    def count_range(self, start_key, end_key):
+        if start_key > end_key:
+            return 0
+        return self._merged_rank(end_key, True) - self._merged_rank(start_key)
+
+    def rank(self, key):
+        return self._merged_rank(key)
+
+    def select(self, index):
+        delta, delta_keys = self._pending
+        base = self._base
+        keys, values = base[0], base[1]
+        if index >= 0:
+            # Array position p sits at merged index p + shift between consecutive adjusted keys
+            shift = 0
+            for key, change in self._adjustments(base, delta, delta_keys):
+                p = self._position(base, key)
+                if index < p + shift:
+                    break
+                if change > 0:
+                    if index == p + shift:
+                        return key, delta[key]
+                    shift += 1
+                else:
+                    shift -= 1
+            p = index - shift
+            if p < len(keys):
+                value = delta.get(keys[p])
+                return keys[p], values[p] if value is None else value
+        raise IndexError("select index out of range")
+
+    def _model_bytes(self, model):
+        return 0
+
+    def memory_stats(self):
+        delta, delta_keys = self._pending
+        keys, values, model = self._base
+        total = (sys.getsizeof(keys) + BPlusTree._container_bytes(values) + self._model_bytes(model)
+                 + BPlusTree._container_bytes(delta_keys) + sys.getsizeof(delta))
+        count = len(self)
+        return {
+            'keys': count,
+            'bytes': total,
+            'bytes_per_key': total / count if count else 0.0,
+        }
+
+# Learned index: piecewise-linear models map a key to its predicted slot in the sorted array,
+# and each prediction is within max_error slots, so the final bisect only covers a small window
+class LearnedIndex(SortedArrayIndex):
+    def __init__(self, max_error=16, delta_limit=256):
+        self.max_error = max_error
+        super().__init__(delta_limit)
+
+    def _build(self, keys):
+        # Greedy shrinking cone: extend a segment from its first key while some slope keeps
+        # every key inside max_error, then start a new one
+        error = self.max_error
+        seg_keys, seg_starts, seg_slopes = array('q'), array('q'), array('d')
+        i, n = 0, len(keys)
+        while i < n:
+            origin = keys[i]
+            low, high = 0.0, float('inf')
+            j = i + 1
+            while j < n:
+                dx = keys[j] - origin
+                new_low = max(low, (j - i - error) / dx)
+                new_high = min(high, (j - i + error) / dx)
+                if new_low > new_high:
+                    break
+                low, high = new_low, new_high
+                j += 1
+            seg_keys.append(origin)
+            seg_starts.append(i)
+            seg_slopes.append(low if high == float('inf') else (low + high) / 2)
+            i = j
+        return seg_keys, seg_starts, seg_slopes
+
+    def _position(self, base, key, right=False):
+        keys, _, (seg_keys, seg_starts, seg_slopes) = base
+        s = bisect_right(seg_keys, key) - 1
+        if s < 0:
+            return 0
+        start = seg_starts[s]
+        end = seg_starts[s + 1] if s + 1 < len(seg_starts) else len(keys)
+        guess = start + int(seg_slopes[s] * (key - seg_keys[s]))
+        # The answer for a key past the segment's last key is the next segment's start, so clamp there
+        hi = min(end, guess + self.max_error + 2)
+        lo = min(hi, max(start, guess - self.max_error - 1))
+        return (bisect_right if right else bisect_left)(keys, key, lo, hi)
+
+    def _model_bytes(self, model):
+        return sum(sys.getsizeof(part) for part in model)
+
+    def stats(self):
+        stats = self.memory_stats()
+        stats['segments'] = len(self._base[2][0])
+        stats['max_error'] = self.max_error
+        stats['pending_writes'] = len(self._pending[0])
+        return stats
+
+# Eytzinger index: the sorted keys are also laid out in BFS order of an implicit binary search tree,
+# so a search walks slots 1, 2-3, 4-7, ... whose first levels share a few cache lines
+class EytzingerIndex(SortedArrayIndex):
+    def _build(self, keys):
+        n = len(keys)
+        layout = array('q', bytes(8 * (n + 1)))
+        layout_rank = array('q', bytes(8 * (n + 1)))
+        # An in-order walk of the implicit tree visits slots in key order
+        i, stack, k = 0, [], 1
+        while stack or k <= n:
+            if k <= n:
+                stack.append(k)
+                k *= 2
+                continue
+            k = stack.pop()
+            layout[k] = keys[i]
+            layout_rank[k] = i
             i += 1
-        
+            k = 2 * k + 1
+        return layout, layout_rank
+
+    def _position(self, base, key, right=False):
+        layout, layout_rank = base[2]
+        n = len(layout) - 1
+        k = 1
+        if right:
+            while k <= n:
+                k = 2 * k + (layout[k] <= key)
+        else:
+            while k <= n:
+                k = 2 * k + (layout[k] < key)
+        # Drop the trailing right turns and the last left turn to land on the answer's slot
+        k >>= ((~k) & (k + 1)).bit_length()
+        return layout_rank[k] if k else n
+
+    def _model_bytes(self, model):
+        return sum(sys.getsizeof(part) for part in model)
+
+# Direct-address index: while game_ids are dense, the value for id k sits at slots[k - base] and
+# gaps hold None; ids too far from the dense block live in a sorted-array fallback
+class DirectAddressIndex(OrderedIndexMixin):
+    # Live counts are kept per block of 1 << BLOCK_BITS slots, summed through a Fenwick tree
+    BLOCK_BITS = 6
+
+    def __init__(self, density_threshold=0.5):
+        if not 0 < density_threshold <= 1:
+            raise ValueError("density_threshold must be in (0, 1]")
+        self.density_threshold = density_threshold
+        self.base = 0
+        self.slots = []
+        self._live = 0
+        self._block_counts = [0]
+        self.outliers = SortedArrayIndex()
+
+    def _rebuild_block_counts(self):
+        size = 1 << self.BLOCK_BITS
+        slots = self.slots
+        tree = [0]
+        for start in range(0, len(slots), size):
+            block = slots[start:start + size]
+            tree.append(len(block) - block.count(None))
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._block_counts = tree
+
+    def _extend_block_counts(self):
+        # Append Fenwick nodes for new, still empty blocks at the top
+        tree = self._block_counts
+        blocks = (len(self.slots) + (1 << self.BLOCK_BITS) - 1) >> self.BLOCK_BITS
+        while len(tree) <= blocks:
+            i = len(tree)
+            tree.append(self._blocks_live(i - 1) - self._blocks_live(i - (i & -i)))
+
+    def _count_slot(self, i, delta):
+        self._live += delta
+        tree = self._block_counts
+        i = (i >> self.BLOCK_BITS) + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _blocks_live(self, blocks):
+        # Live slots in the first `blocks` blocks
+        tree, total = self._block_counts, 0
+        while blocks > 0:
+            total += tree[blocks]
+            blocks -= blocks & -blocks
+        return total
+
+    def _live_before(self, pos):
+        start = (pos >> self.BLOCK_BITS) << self.BLOCK_BITS
+        partial = self.slots[start:pos]
+        return self._blocks_live(pos >> self.BLOCK_BITS) + len(partial) - partial.count(None)
+
+    def bulk_load(self, sorted_iterable, fill_factor=None):
+        keys, values = self._sorted_pairs(sorted_iterable)
+        # Peel off whichever end sits behind the wider gap until the rest is dense enough to address directly
+        lo, hi = 0, len(keys)
+        while hi - lo > 1 and (hi - lo) / (keys[hi - 1] - keys[lo] + 1) < self.density_threshold:
+            if keys[lo + 1] - keys[lo] > keys[hi - 1] - keys[hi - 2]:
+                lo += 1
+            else:
+                hi -= 1
+        self.slots, self._live = [], hi - lo
+        if hi > lo:
+            self.base = keys[lo]
+            self.slots = [None] * (keys[hi - 1] - keys[lo] + 1)
+            for i in range(lo, hi):
+                self.slots[keys[i] - self.base] = values[i]
+        self._rebuild_block_counts()
+        self.outliers = SortedArrayIndex()
+        self.outliers.bulk_load(zip(keys[:lo] + keys[hi:], values[:lo] + values[hi:]))
+
+    def _fits(self, key):
+        # Whether growing the slot array to cover key keeps it above the density threshold
+        if not self.slots:
+            return True
+        span = max(key, self.base + len(self.slots) - 1) - min(key, self.base) + 1
+        return (self._live + 1) / span >= self.density_threshold
+
+    def _grow(self, key):
+        if not self.slots:
+            self.base = key
+            self.slots = [None]
+            self._rebuild_block_counts()
+        elif key < self.base:
+            # Re-base: shift the block up so the new id gets slot 0; block boundaries move too
+            self.slots = [None] * (self.base - key) + self.slots
+            self.base = key
+            self._rebuild_block_counts()
+        else:
+            self.slots.extend([None] * (key - self.base - len(self.slots) + 1))
+            self._extend_block_counts()
+        # Pull in fallback ids the wider block now covers
+        top = self.base + len(self.slots) - 1
+        for moved_key, value in list(self.outliers.iter_range(self.base, top)):
+            self.outliers.delete(moved_key)
+            self.slots[moved_key - self.base] = value
+            self._count_slot(moved_key - self.base, 1)
+
+    def upsert(self, key, value):
+        i = key - self.base
+        if not 0 <= i < len(self.slots):
+            if self.outliers.search(key) is not None or not self._fits(key):
+                return self.outliers.upsert(key, value)
+            self._grow(key)
+            i = key - self.base
+        existed = self.slots[i] is not None
+        if not existed:
+            self._count_slot(i, 1)
+        self.slots[i] = value
+        return existed
+
+    def insert(self, key, value):
+        self.upsert(key, value)
+
+    def replace(self, key, value):
+        i = key - self.base
+        if 0 <= i < len(self.slots):
+            if self.slots[i] is None:
+                return False
+            self.slots[i] = value
+            return True
+        return self.outliers.replace(key, value)
+
+    def delete(self, key):
+        i = key - self.base
+        if not 0 <= i < len(self.slots):
+            return self.outliers.delete(key)
+        if self.slots[i] is None:
+            return False
+        self.slots[i] = None
+        self._count_slot(i, -1)
+        # Trimmed blocks keep their (zero) Fenwick nodes for when the block grows back
+        while self.slots and self.slots[-1] is None:
+            self.slots.pop()
+        # Well below the threshold: rebuild, which re-picks the dense block or hands everything to the fallback
+        if self._live < len(self.slots) * self.density_threshold / 2:
+            self.bulk_load(list(self.items()))
+        return True
+
+    def search(self, key):
+        i = key - self.base
+        if 0 <= i < len(self.slots):
+            return self.slots[i]
+        return self.outliers.search(key)
+
+    def search_many(self, keys):
+        return [self.search(key) for key in keys]
+
+    def _slot_span(self, start_key, end_key):
+        lo = 0 if start_key is None else min(max(start_key - self.base, 0), len(self.slots))
+        hi = len(self.slots) if end_key is None else min(max(end_key - self.base + 1, 0), len(self.slots))
+        return lo, max(lo, hi)
+
+    def _iter(self, start_key, end_key, reverse=False, start_exclusive=False, end_exclusive=False):
+        # game_ids are ints, so exclusive bounds become inclusive ones a step inward
+        if start_key is not None and start_exclusive:
+            start_key += 1
+        if end_key is not None and end_exclusive:
+            end_key -= 1
+        lo, hi = self._slot_span(start_key, end_key)
+        slots, base = self.slots, self.base
+        positions = range(hi - 1, lo - 1, -1) if reverse else range(lo, hi)
+        dense = ((base + i, slots[i]) for i in positions if slots[i] is not None)
+        if not len(self.outliers):
+            yield from dense
+            return
+        yield from heapq.merge(dense, self.outliers._iter(start_key, end_key, reverse),
+                               key=lambda pair: pair[0], reverse=reverse)
+
+    # Order statistics: O(log n) over the block counts plus a scan inside at most two blocks
+    def __len__(self):
+        return self._live + len(self.outliers)
+
+    def count_range(self, start_key, end_key):
+        if start_key > end_key:
+            return 0
+        lo, hi = self._slot_span(start_key, end_key)
+        return self._live_before(hi) - self._live_before(lo) + self.outliers.count_range(start_key, end_key)
+
+    def rank(self, key):
+        lo, _ = self._slot_span(key, None)
+        return self._live_before(lo) + self.outliers.rank(key)
+
+    def select(self, index):
+        if index < 0:
+            raise IndexError("select index out of range")
+        below = self.outliers.rank(self.base) if self.slots else len(self.outliers)
+        if index < below:
+            return self.outliers.select(index)
+        index -= below
+        if index >= self._live:
+            return self.outliers.select(below + index - self._live)
+        # Fenwick descent to the block holding the index-th live slot, then a scan inside it
+        tree, block, step = self._block_counts, 0, 1 << (len(self._block_counts).bit_length() - 1)
+        while step:
+            if block + step < len(tree) and tree[block + step] <= index:
+                block += step
+                index -= tree[block]
+            step >>= 1
+        slots, start = self.slots, block << self.BLOCK_BITS
+        for i in range(start, min(start + (1 << self.BLOCK_BITS), len(slots))):
+            if slots[i] is not None:
+                if index == 0:
+                    return self.base + i, slots[i]
+                index -= 1
+
+    def memory_stats(self):
+        total = BPlusTree._container_bytes(self.slots) - self.slots.count(None) * sys.getsizeof(None)
+        total += self.outliers.memory_stats()['bytes']
+        keys = len(self)
+        return {
+            'keys': keys,
+            'bytes': total,
+            'bytes_per_key': total / keys if keys else 0.0,
+        }
+
+    def stats(self):
+        stats = self.memory_stats()
+        stats['base'] = self.base
+        stats['slots'] = len(self.slots)
+        stats['density'] = self._live / len(self.slots) if self.slots else 0.0
+        stats['outliers'] = len(self.outliers)
+        return stats
+
+# Open-addressing int64 -> title table for HashIndex: keys and int32 value-store slots live in flat
+# parallel arrays probed linearly, and growth moves a few entries per operation instead of all at once
+class OpenAddressingTable:
+    __slots__ = ('bits', 'keys', 'slots', 'count')
+
+    EMPTY = -1
+
+    def __init__(self, bits):
+        self.bits = bits
+        self.keys = array('q', bytes(8 << bits))
+        self.slots = array('i', [self.EMPTY]) * (1 << bits)
+        self.count = 0
+
+    def home(self, key):
+        # Fibonacci hashing: the top bits of key * 2^64 / phi
+        return ((key * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> (64 - self.bits)
+
+    def find(self, key):
+        keys, slots, mask = self.keys, self.slots, (1 << self.bits) - 1
+        i = self.home(key)
+        while slots[i] != self.EMPTY:
+            if keys[i] == key:
+                return i
+            i = (i + 1) & mask
+        return -1
+
+    def put(self, key, slot):
+        # The caller has checked that key is absent
+        slots, mask = self.slots, (1 << self.bits) - 1
+        i = self.home(key)
+        while slots[i] != self.EMPTY:
+            i = (i + 1) & mask
+        self.keys[i] = key
+        slots[i] = slot
+        self.count += 1
+
+    def remove_at(self, i):
+        # Backward-shift deletion: pull later cluster members into the hole, so no tombstones are needed
+        keys, slots, mask = self.keys, self.slots, (1 << self.bits) - 1
         j = i
-        while j < len(node.children):
-            if j > 0 and j <= len(node.keys) and node.keys[j-1] > end_key:
+        while True:
+            j = (j + 1) & mask
+            if slots[j] == self.EMPTY:
                 break
-            self._range_search(node.children[j], start_key, end_key, results)
-            j += 1
-
+            home = self.home(keys[j])
+            if (i < home <= j) if i <= j else (home > i or home <= j):
+                continue
+            keys[i] = keys[j]
+            slots[i] = slots[j]
+            i = j
+        slots[i] = self.EMPTY
+        self.count -= 1
+
+class IntHashTable(ValueStoreMixin, MutableMapping):
+    MAX_LOAD = 0.7
+    # Old-table slots visited per write while a resize is in progress
+    MIGRATE_STEP = 16
+
+    def __init__(self, bits=10):
+        self._table = OpenAddressingTable(bits)
+        self._old = None
+        self._cursor = 0
+        # Backward shifts and migration move entries between probe positions, so readers take the lock too
+        self._lock = threading.Lock()
+        # Titles are stored once and both tables refer to them by slot, so a resize only moves ints
+        self._init_value_store()
+
+    def _migrate(self):
+        old, steps = self._old, self.MIGRATE_STEP
+        size = 1 << old.bits
+        while steps and self._cursor < size:
+            steps -= 1
+            slot = old.slots[self._cursor]
+            if slot == old.EMPTY:
+                self._cursor += 1
+            else:
+                # Backward shift may refill this position, so the cursor stays put
+                self._table.put(old.keys[self._cursor], slot)
+                old.remove_at(self._cursor)
+        if self._cursor == size:
+            self._old = None
+
+    def _locate(self, key):
+        # (table, position) of key, or (None, -1); callers hold the lock
+        i = self._table.find(key)
+        if i >= 0:
+            return self._table, i
+        if self._old is not None:
+            i = self._old.find(key)
+            if i >= 0:
+                return self._old, i
+        return None, -1
+
+    def get(self, key, default=None):
+        with self._lock:
+            table, i = self._locate(key)
+            return default if table is None else self.value_store[table.slots[i]]
+
+    def __getitem__(self, key):
+        with self._lock:
+            table, i = self._locate(key)
+            if table is None:
+                raise KeyError(key)
+            return self.value_store[table.slots[i]]
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._locate(key)[0] is not None
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            # Only writes advance a resize, so reads never move entries
+            if self._old is not None:
+                self._migrate()
+            table, i = self._locate(key)
+            if table is not None:
+                self.value_store[table.slots[i]] = value
+                return
+            if self._old is None and self._table.count + 1 > self.MAX_LOAD * (1 << self._table.bits):
+                self._old, self._table, self._cursor = self._table, OpenAddressingTable(self._table.bits + 1), 0
+            self._table.put(key, self._store(value))
+
+    def __delitem__(self, key):
+        with self._lock:
+            if self._old is not None:
+                self._migrate()
+            table, i = self._locate(key)
+            if table is None:
+                raise KeyError(key)
+            slot = table.slots[i]
+            table.remove_at(i)
+            self._release(slot)
+
+    def __len__(self):
+        with self._lock:
+            return self._table.count + (self._old.count if self._old is not None else 0)
+
+    def __iter__(self):
+        with self._lock:
+            keys = []
+            for table in (self._table, self._old):
+                if table is not None:
+                    slots = table.slots
+                    keys.extend(table.keys[i] for i in range(len(slots)) if slots[i] != table.EMPTY)
+        yield from keys
+
+    def memory_stats(self):
+        # Titles are left out: they cost the same whichever engine holds them
+        total = sys.getsizeof(self.value_store) + sys.getsizeof(self._free_slots)
+        for table in (self._table, self._old):
+            if table is not None:
+                total += sys.getsizeof(table.keys) + sys.getsizeof(table.slots)
+        keys = len(self)
+        return {
+            'keys': keys,
+            'bytes': total,
+            'bytes_per_key': total / keys if keys else 0.0,
+        }
+
+# Minimal perfect hash table for HashIndex (CHD): every static key maps to its own slot in 0..n-1 via a
+# per-bucket displacement, so a lookup is one bucket read and one slot check. Keys added later sit in a
+# small overflow dict until a background rebuild folds them into a fresh static table
+class PerfectHashTable(MutableMapping):
+    # Average keys per displacement bucket; fewer means more bits per key but a faster build
+    BUCKET_SIZE = 2
+    # Marks a static key deleted until the next rebuild drops it
+    TOMBSTONE = object()
+    MASK64 = (1 << 64) - 1
+
+    def __init__(self, rebuild_min=64):
+        self.rebuild_min = rebuild_min
+        # ((keys, values, displacements), overflow dict), swapped whole so readers never see a half-built
+        # table or a new table paired with the old overflow
+        self._state = ((array('q'), [], array('i')), {})
+        self._static_live = 0
+        self._lock = threading.Lock()
+        self._rebuild_thread = None
+        # Writes made while a rebuild runs, replayed onto its result
+        self._journal = None
+        self.rebuilds = 0
+
+    @classmethod
+    def _build(cls, pairs):
+        n = len(pairs)
+        buckets = [[] for _ in range(max(1, -(-n // cls.BUCKET_SIZE)))]
+        for key, value in pairs:
+            h = BloomFilter._mix(key & cls.MASK64)
+            buckets[(h * len(buckets)) >> 64].append((h, key, value))
+        keys = array('q', bytes(8 * n))
+        values = [None] * n
+        displacements = array('i', bytes(4 * len(buckets)))
+        taken = bytearray(n)
+        free = None
+        # Largest buckets first, while the table is still empty enough to place them
+        for b in sorted(range(len(buckets)), key=lambda b: len(buckets[b]), reverse=True):
+            bucket = buckets[b]
+            if not bucket:
+                break
+            if len(bucket) == 1:
+                # Singletons take any free slot directly, stored as a negative displacement
+                if free is None:
+                    free = [pos for pos in range(n) if not taken[pos]]
+                positions = [free.pop()]
+                displacements[b] = -positions[0] - 1
+            else:
+                d = 0
+                while True:
+                    positions = [(BloomFilter._mix(h + d) * n) >> 64 for h, _, _ in bucket]
+                    if len(set(positions)) == len(bucket) and not any(taken[pos] for pos in positions):
+                        break
+                    d += 1
+                displacements[b] = d
+            for pos, (_, key, value) in zip(positions, bucket):
+                taken[pos] = 1
+                keys[pos] = key
+                values[pos] = value
+        return keys, values, displacements
+
+    def _find(self, static, key):
+        keys, _, displacements = static
+        n = len(keys)
+        if not n:
+            return -1
+        h = BloomFilter._mix(key & self.MASK64)
+        d = displacements[(h * len(displacements)) >> 64]
+        pos = -d - 1 if d < 0 else (BloomFilter._mix(h + d) * n) >> 64
+        return pos if keys[pos] == key else -1
+
+    def get(self, key, default=None):
+        static, overflow = self._state
+        pos = self._find(static, key)
+        if pos >= 0:
+            value = static[1][pos]
+            return default if value is self.TOMBSTONE else value
+        return overflow.get(key, default)
+
+    def __getitem__(self, key):
+        value = self.get(key, self.TOMBSTONE)
+        if value is self.TOMBSTONE:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, self.TOMBSTONE) is not self.TOMBSTONE
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._write_locked(key, value)
+            if self._journal is not None:
+                self._journal[key] = value
+            self._maybe_rebuild_locked()
+
+    def __delitem__(self, key):
+        with self._lock:
+            if self.get(key, self.TOMBSTONE) is self.TOMBSTONE:
+                raise KeyError(key)
+            self._write_locked(key, self.TOMBSTONE)
+            if self._journal is not None:
+                self._journal[key] = self.TOMBSTONE
+            self._maybe_rebuild_locked()
+
+    def _write_locked(self, key, value):
+        self._static_live += self._apply(self._state, key, value)
+
+    def _apply(self, state, key, value):
+        # Static keys are updated in place; only new keys go to the overflow dict.
+        # Returns the change in live static keys
+        static, overflow = state
+        pos = self._find(static, key)
+        if pos >= 0:
+            change = (static[1][pos] is self.TOMBSTONE) - (value is self.TOMBSTONE)
+            static[1][pos] = value
+            return change
+        if value is self.TOMBSTONE:
+            overflow.pop(key, None)
+        else:
+            overflow[key] = value
+        return 0
+
+    def _maybe_rebuild_locked(self):
+        static, overflow = self._state
+        stale = len(overflow) + len(static[0]) - self._static_live
+        if self._rebuild_thread is None and stale >= max(self.rebuild_min, len(static[0]) // 8):
+            # The journal starts before the snapshot, so replaying it covers every write the snapshot missed
+            self._journal = {}
+            self._rebuild_thread = threading.Thread(target=self._rebuild, daemon=True)
+            self._rebuild_thread.start()
+
+    def _snapshot(self):
+        (keys, values, _), overflow = self._state
+        pairs = [(keys[pos], value) for pos, value in enumerate(list(values)) if value is not self.TOMBSTONE]
+        pairs.extend(list(overflow.items()))
+        return pairs
+
+    def _rebuild(self):
+        pairs = self._snapshot()
+        state = (self._build(pairs), {})
+        with self._lock:
+            journal, self._journal = self._journal, None
+            live = len(pairs)
+            for key, value in journal.items():
+                live += self._apply(state, key, value)
+            self._state, self._static_live = state, live
+            self._rebuild_thread = None
+            self.rebuilds += 1
+
+    def wait_for_rebuild(self):
+        with self._lock:
+            thread = self._rebuild_thread
+        if thread is not None:
+            thread.join()
+
+    def update(self, pairs=(), **kwargs):
+        # Filling an empty table builds the static part directly
+        if len(self) or kwargs:
+            return super().update(pairs, **kwargs)
+        pairs = list(pairs.items() if isinstance(pairs, dict) else pairs)
+        with self._lock:
+            self._state, self._static_live = (self._build(pairs), {}), len(pairs)
+
+    def __len__(self):
+        return self._static_live + len(self._state[1])
+
+    def __iter__(self):
+        (keys, values, _), overflow = self._state
+        for pos in range(len(keys)):
+            if values[pos] is not self.TOMBSTONE:
+                yield keys[pos]
+        yield from list(overflow)
+
+    def memory_stats(self):
+        # Titles are left out: they cost the same whichever engine holds them
+        (keys, values, displacements), overflow = self._state
+        total = (sys.getsizeof(keys) + sys.getsizeof(values) + sys.getsizeof(displacements)
+                 + sys.getsizeof(overflow) + sum(sys.getsizeof(key) for key in overflow))
+        count = len(self)
+        return {
+            'keys': count,
+            'bytes': total,
+            'bytes_per_key': total / count if count else 0.0,
+            # The hash function itself: just the displacement array
+            'hash_bits_per_key': len(displacements) * displacements.itemsize * 8 / len(keys) if keys else 0.0,
+            'overflow': len(overflow),
+            'rebuilds': self.rebuilds,
+        }
+
+# Cuckoo hash table for HashIndex: each key lives in one of two slots picked by independent halves of
+# one 64-bit hash, or in a small stash, so a lookup never probes more than two slots and the stash
+class CuckooTable:
+    __slots__ = ('bits', 'keys', 'slots', 'stash', 'count')
+
+    EMPTY = -1
+
+    def __init__(self, bits):
+        self.bits = bits
+        self.keys = array('q', bytes(8 << bits))
+        self.slots = array('i', [self.EMPTY]) * (1 << bits)
+        # key -> value-store slot for keys that lost every eviction chain
+        self.stash = {}
+        self.count = 0
+
+    def homes(self, key):
+        h = BloomFilter._mix(key & 0xFFFFFFFFFFFFFFFF)
+        return h >> (64 - self.bits), h & ((1 << self.bits) - 1)
+
+    def find(self, key):
+        keys, slots = self.keys, self.slots
+        first, second = self.homes(key)
+        if slots[first] != self.EMPTY and keys[first] == key:
+            return first
+        if slots[second] != self.EMPTY and keys[second] == key:
+            return second
+        return -1
+
+    def place(self, key, slot, max_kicks):
+        # Kick residents to their other home until something lands in an empty slot; the key left
+        # holding at the end goes to the stash
+        keys, slots = self.keys, self.slots
+        pos = self.homes(key)[0]
+        for _ in range(max_kicks):
+            if slots[pos] == self.EMPTY:
+                keys[pos] = key
+                slots[pos] = slot
+                self.count += 1
+                return
+            key, keys[pos] = keys[pos], key
+            slot, slots[pos] = slots[pos], slot
+            first, second = self.homes(key)
+            pos = second if pos == first else first
+        self.stash[key] = slot
+
+    def entries(self):
+        keys, slots = self.keys, self.slots
+        pairs = [(keys[i], slots[i]) for i in range(len(slots)) if slots[i] != self.EMPTY]
+        pairs.extend(self.stash.items())
+        return pairs
+
+class CuckooHashTable(ValueStoreMixin, MutableMapping):
+    # Two single-slot choices stay reliable below half load
+    MAX_LOAD = 0.45
+    MAX_KICKS = 64
+    STASH_LIMIT = 8
+    # Old-table slots moved per write while a grow is in progress
+    MIGRATE_STEP = 16
+
+    def __init__(self, bits=10):
+        self._table = CuckooTable(bits)
+        # While growing, entries not yet moved stay in the old table and lookups check both
+        self._old = None
+        self._cursor = 0
+        # An eviction chain briefly holds a key outside the table, so reads take the lock as well
+        self._lock = threading.Lock()
+        self._init_value_store()
+
+    def _place_locked(self, key, slot):
+        self._table.place(key, slot, self.MAX_KICKS)
+        if self._old is None and len(self._table.stash) > self.STASH_LIMIT:
+            self._start_grow_locked()
+
+    def _start_grow_locked(self):
+        self._old, self._table, self._cursor = self._table, CuckooTable(self._table.bits + 1), 0
+
+    def _migrate_locked(self):
+        old, steps = self._old, self.MIGRATE_STEP
+        size = len(old.slots)
+        while steps and self._cursor < size:
+            steps -= 1
+            slot = old.slots[self._cursor]
+            if slot != old.EMPTY:
+                self._table.place(old.keys[self._cursor], slot, self.MAX_KICKS)
+                old.slots[self._cursor] = old.EMPTY
+                old.count -= 1
+            self._cursor += 1
+        if self._cursor == size:
+            for key, slot in old.stash.items():
+                self._table.place(key, slot, self.MAX_KICKS)
+            self._old = None
+            # A stash that overflowed mid-grow starts the next grow
+            if len(self._table.stash) > self.STASH_LIMIT:
+                self._start_grow_locked()
+
+    def _slot_locked(self, key):
+        # Two slots and the stash of the new table, then of the old one while a grow is in progress
+        for table in (self._table, self._old):
+            if table is None:
+                break
+            pos = table.find(key)
+            if pos >= 0:
+                return table.slots[pos]
+            if table.stash and key in table.stash:
+                return table.stash[key]
+        return None
+
+    def get(self, key, default=None):
+        with self._lock:
+            slot = self._slot_locked(key)
+            return default if slot is None else self.value_store[slot]
+
+    def __getitem__(self, key):
+        with self._lock:
+            slot = self._slot_locked(key)
+            if slot is None:
+                raise KeyError(key)
+            return self.value_store[slot]
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._slot_locked(key) is not None
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            # Only writes advance a grow, so no single operation rehashes the whole table
+            if self._old is not None:
+                self._migrate_locked()
+            slot = self._slot_locked(key)
+            if slot is not None:
+                self.value_store[slot] = value
+                return
+            if self._old is None and self._table.count + 1 > self.MAX_LOAD * len(self._table.slots):
+                self._start_grow_locked()
+            self._place_locked(key, self._store(value))
+
+    def __delitem__(self, key):
+        with self._lock:
+            if self._old is not None:
+                self._migrate_locked()
+            for table in (table for table in (self._table, self._old) if table is not None):
+                pos = table.find(key)
+                if pos >= 0:
+                    slot = table.slots[pos]
+                    table.slots[pos] = table.EMPTY
+                    table.count -= 1
+                    break
+                if key in table.stash:
+                    slot = table.stash.pop(key)
+                    break
+            else:
+                raise KeyError(key)
+            self._release(slot)
+
+    def __len__(self):
+        with self._lock:
+            return sum(table.count + len(table.stash) for table in (self._table, self._old) if table is not None)
+
+    def __iter__(self):
+        with self._lock:
+            keys = []
+            for table in (self._table, self._old):
+                if table is not None:
+                    keys.extend(key for key, _ in table.entries())
+        yield from keys
+
+    def memory_stats(self):
+        # Titles are left out: they cost the same whichever engine holds them
+        tables = [table for table in (self._table, self._old) if table is not None]
+        total = sys.getsizeof(self.value_store) + sys.getsizeof(self._free_slots)
+        for table in tables:
+            total += sys.getsizeof(table.keys) + sys.getsizeof(table.slots) + sys.getsizeof(table.stash)
+        keys = len(self)
+        return {
+            'keys': keys,
+            'bytes': total,
+            'bytes_per_key': total / keys if keys else 0.0,
+            'stash': sum(len(table.stash) for table in tables),
+        }
+
+# Hash index with an order-preserving bucket directory: the mapping engine serves equality lookups, and every
+# key is also filed under bucket game_id // bucket_width, so range queries only visit overlapping buckets
 class HashIndex:
-    def __init__(self):
-        self.index = {}
+    ENGINES = {'dict': dict, 'open': IntHashTable, 'perfect': PerfectHashTable, 'cuckoo': CuckooHashTable}
+
+    def __init__(self, bucket_width=64, engine='dict'):
+        if bucket_width < 1:
+            raise ValueError("bucket_width must be at least 1")
+        if engine not in self.ENGINES:
+            raise ValueError(f"engine must be one of {', '.join(self.ENGINES)}")
+        self.bucket_width = bucket_width
+        self.engine = engine
+        self.index = self.ENGINES[engine]()
+        # Bucket number -> sorted int64 array of its keys, plus the sorted non-empty bucket numbers;
+        # unboxed, so the array engines do not pay for a second copy of every key as a Python int
+        self.buckets = {}
+        self.bucket_ids = array('q')
+
+    def _file_key(self, key):
+        bucket_id = key // self.bucket_width
+        bucket = self.buckets.get(bucket_id)
+        if bucket is None:
+            bucket = self.buckets[bucket_id] = array('q')
+            insort(self.bucket_ids, bucket_id)
+        insort(bucket, key)
+
+    def _unfile_key(self, key):
+        bucket_id = key // self.bucket_width
+        bucket = self.buckets[bucket_id]
+        del bucket[bisect_left(bucket, key)]
+        if not bucket:
+            del self.buckets[bucket_id]
+            del self.bucket_ids[bisect_left(self.bucket_ids, bucket_id)]
+
+    def _rebuild_buckets(self):
+        self.buckets = {}
+        for key in sorted(self.index):
+            bucket = self.buckets.get(key // self.bucket_width)
+            if bucket is None:
+                bucket = self.buckets[key // self.bucket_width] = array('q')
+            bucket.append(key)
+        self.bucket_ids = array('q', sorted(self.buckets))
 
     def insert(self, key, value):
+        if key not in self.index:
+            self._file_key(key)
         self.index[key] = value
 
+    def upsert(self, key, value):
+        existed = key in self.index
+        self.insert(key, value)
+        return existed
+
+    def delete(self, key):
+        if key in self.index:
+            del self.index[key]
+            self._unfile_key(key)
+            return True
+        return False
+
     def search(self, key):
         return self.index.get(key)
 
+    def search_many(self, keys):
+        get = self.index.get
+        return [get(key) for key in keys]
+
     def range_search(self, start_key, end_key):
-        results = []
-        for key, value in self.index.items():
-            if start_key <= key <= end_key:
-                results.append((key, value))
-        return sorted(results, key=lambda x: x[0])
+        return list(self.iter_range(start_key, end_key))
+
+    def save_snapshot(self, path, change_seq=0):
+        IndexSnapshot.write(path, IndexSnapshot.KIND_HASH, change_seq, self.index.items())
+
+    def bulk_load(self, pairs):
+        self.index = self.ENGINES[self.engine]()
+        self.index.update(pairs)
+        self._rebuild_buckets()
+
+    def load_snapshot(self, path):
+        change_seq, records = IndexSnapshot.read(path, IndexSnapshot.KIND_HASH)
+        self.bulk_load(records)
+        return change_seq
+
+    def memory_stats(self):
+        # Equality engine plus the bucket directory, titles excluded
+        if isinstance(self.index, dict):
+            keys = len(self.index)
+            stats = {'keys': keys, 'bytes': sys.getsizeof(self.index) + sum(sys.getsizeof(key) for key in self.index)}
+        else:
+            stats = self.index.memory_stats()
+        directory = sys.getsizeof(self.buckets) + BPlusTree._container_bytes(self.bucket_ids)
+        directory += sum(sys.getsizeof(bucket) for bucket in self.buckets.values())
+        # Bucket numbers are dict keys too
+        directory += sum(sys.getsizeof(bucket_id) for bucket_id in self.bucket_ids)
+        stats['engine_bytes'] = stats['bytes']
+        stats['directory_bytes'] = directory
+        stats['bytes'] += directory
+        stats['bytes_per_key'] = stats['bytes'] / stats['keys'] if stats['keys'] else 0.0
+        return stats
+
+    def _iter_keys(self, start_key, end_key):
+        bucket_ids, buckets = self.bucket_ids, self.buckets
+        i = bisect_left(bucket_ids, start_key // self.bucket_width)
+        last_bucket = end_key // self.bucket_width
+        while i < len(bucket_ids) and bucket_ids[i] <= last_bucket:
+            bucket = buckets[bucket_ids[i]]
+            # Only the first and last overlapping buckets need trimming
+            lo = bisect_left(bucket, start_key) if bucket[0] < start_key else 0
+            hi = bisect_right(bucket, end_key) if bucket[-1] > end_key else len(bucket)
+            yield from islice(bucket, lo, hi)
+            i += 1
+
+    def iter_range(self, start_key, end_key, limit=None, after_key=None):
+        # Yield (key, value) pairs in key order; game_id keys are ints, so after_key resumes at after_key + 1
+        if after_key is not None and after_key >= start_key:
+            start_key = after_key + 1
+        if start_key > end_key:
+            return
+        index = self.index
+        for key in islice(self._iter_keys(start_key, end_key), limit):
+            yield key, index[key]
+
+# Versioned binary index snapshot: header, (game_id, title) records, CRC32 of everything before it
+class IndexSnapshot:
+    MAGIC = b"GMSSNP"
+    VERSION = 1
+    KIND_BPLUS = 1
+    KIND_HASH = 2
+    # magic, version, index kind, change sequence the snapshot reflects, record count
+    HEADER = struct.Struct("<6sHBqQ")
+    RECORD = struct.Struct("<qI")
+    TRAILER = struct.Struct("<I")
+
+    @classmethod
+    def write(cls, path, kind, change_seq, pairs):
+        # Written beside the target and renamed over it, so a crash never leaves a torn snapshot
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w+b") as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, kind, change_seq, 0))
+            count = 0
+            for game_id, title in pairs:
+                data = title.encode("utf-8")
+                f.write(cls.RECORD.pack(game_id, len(data)))
+                f.write(data)
+                count += 1
+            f.seek(0)
+            f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, kind, change_seq, count))
+            f.seek(0)
+            crc = cls._crc(f)
+            f.seek(0, os.SEEK_END)
+            f.write(cls.TRAILER.pack(crc))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _crc(f, chunk_size=1 << 20):
+        crc = 0
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            crc = zlib.crc32(chunk, crc)
+        return crc
+
+    @classmethod
+    def read(cls, path, kind):
+        # Returns (change_seq, records); raises ValueError for anything but an intact snapshot of kind
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < cls.HEADER.size + cls.TRAILER.size:
+            raise ValueError(f"{path} is truncated")
+        (crc,) = cls.TRAILER.unpack_from(data, len(data) - cls.TRAILER.size)
+        body = memoryview(data)[:len(data) - cls.TRAILER.size]
+        if zlib.crc32(body) != crc:
+            raise ValueError(f"{path} failed its checksum")
+        magic, version, file_kind, change_seq, count = cls.HEADER.unpack_from(body, 0)
+        if magic != cls.MAGIC or version != cls.VERSION or file_kind != kind:
+            raise ValueError(f"{path} is not a version {cls.VERSION} snapshot of this index")
+        return change_seq, cls._records(body, count)
+
+    @classmethod
+    def _records(cls, body, count):
+        offset = cls.HEADER.size
+        for _ in range(count):
+            game_id, length = cls.RECORD.unpack_from(body, offset)
+            offset += cls.RECORD.size
+            yield game_id, bytes(body[offset:offset + length]).decode("utf-8")
+            offset += length
+
+# Append-only write-ahead log of index mutations, fsync-ed in groups and replayed over a snapshot
+class IndexWAL:
+    OP_UPSERT = 1
+    OP_DELETE = 2
+    # crc32 of the rest of the record, lsn, op, game_id, title length; the UTF-8 title follows
+    RECORD = struct.Struct("<IQBqI")
+
+    def __init__(self, path, group_commit_interval=0.05):
+        self.path = path
+        self.group_commit_interval = group_commit_interval
+        self._lock = threading.Lock()
+        self._pending = False
+        self._last_sync = time.monotonic()
+        # A crash can leave a torn record at the tail; cut it off before appending after it
+        with open(path, "a+b") as f:
+            f.seek(0)
+            valid_length = self._valid_length(f.read())
+            f.truncate(valid_length)
+        self._file = open(path, "ab")
+        self._closed = threading.Event()
+        self._flusher = None
+        if group_commit_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flusher.start()
+
+    @classmethod
+    def _scan(cls, data):
+        # Yields (start, end, lsn, op, game_id, title) up to the first torn or corrupt record
+        offset = 0
+        while offset + cls.RECORD.size <= len(data):
+            crc, lsn, op, game_id, length = cls.RECORD.unpack_from(data, offset)
+            end = offset + cls.RECORD.size + length
+            if end > len(data) or zlib.crc32(data[offset + 4:end]) != crc:
+                return
+            title = data[offset + cls.RECORD.size:end].decode("utf-8") if op == cls.OP_UPSERT else None
+            yield offset, end, lsn, op, game_id, title
+            offset = end
+
+    @classmethod
+    def _valid_length(cls, data):
+        end = 0
+        for _, end, *_ in cls._scan(data):
+            pass
+        return end
+
+    def append(self, lsn, op, game_id, title=None):
+        data = title.encode("utf-8") if title is not None else b""
+        body = self.RECORD.pack(0, lsn, op, game_id, len(data))[4:] + data
+        with self._lock:
+            self._file.write(struct.pack("<I", zlib.crc32(body)) + body)
+            self._pending = True
+            # Group commit: whichever append finds the interval elapsed syncs for everyone before it
+            if time.monotonic() - self._last_sync >= self.group_commit_interval:
+                self._sync_locked()
+
+    def _sync_locked(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = False
+        self._last_sync = time.monotonic()
+
+    def sync(self):
+        with self._lock:
+            if self._pending:
+                self._sync_locked()
+
+    def _flush_loop(self):
+        # Bounds how long a quiet period can leave appended records unsynced
+        while not self._closed.wait(self.group_commit_interval):
+            self.sync()
+
+    def _read(self):
+        with self._lock:
+            self._file.flush()
+            with open(self.path, "rb") as f:
+                return f.read()
+
+    def replay(self, after_lsn=0):
+        # (lsn, op, game_id, title) for every intact record newer than after_lsn, in log order
+        for _, _, lsn, op, game_id, title in self._scan(self._read()):
+            if lsn > after_lsn:
+                yield lsn, op, game_id, title
+
+    def checkpoint(self, lsn):
+        # Drop the records a snapshot taken at lsn already covers
+        with self._lock:
+            self._file.flush()
+            with open(self.path, "rb") as f:
+                data = f.read()
+            kept = b"".join(data[start:end] for start, end, record_lsn, *_ in self._scan(data) if record_lsn > lsn)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(kept)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self._file.close()
+            self._file = open(self.path, "ab")
+            self._pending = False
+
+    def close(self):
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.sync()
+        self._file.close()
+
+# Blocked Bloom filter over game_ids: each key sets k bits inside a single 64-bit block,
+# so a membership test is one array read and a mask compare
+class BloomFilter:
+    MASK64 = (1 << 64) - 1
+
+    def __init__(self, capacity=1024, false_positive_rate=0.01):
+        self.capacity = max(capacity, 1)
+        self.false_positive_rate = false_positive_rate
+        # Uneven block loads cost accuracy against a flat filter, so allocate a quarter more bits
+        bits = math.ceil(-1.25 * self.capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        # At most 10 hashes, since every hash takes 6 bits of one 64-bit mix
+        self.hashes = min(10, max(1, round(bits / self.capacity * math.log(2))))
+        self.blocks = array('Q', bytes(8 * max(1, math.ceil(bits / 64))))
+        self.count = 0
+
+    @classmethod
+    def _mix(cls, value):
+        # splitmix64 finalizer
+        value = (value + 0x9E3779B97F4A7C15) & cls.MASK64
+        value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & cls.MASK64
+        value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & cls.MASK64
+        return value ^ (value >> 31)
+
+    def _probe(self, key):
+        first = self._mix(key & self.MASK64)
+        second = self._mix(first)
+        block = (first * len(self.blocks)) >> 64
+        mask = 0
+        for _ in range(self.hashes):
+            mask |= 1 << (second & 63)
+            second >>= 6
+        return block, mask
+
+    def add(self, key):
+        block, mask = self._probe(key)
+        self.blocks[block] |= mask
+        self.count += 1
+
+    def might_contain(self, key):
+        block, mask = self._probe(key)
+        return self.blocks[block] & mask == mask
+
+    def stats(self):
+        bits = len(self.blocks) * 64
+        # An absent key lands in one block and must find all of its bits set there
+        fill = [bin(block).count("1") / 64 for block in self.blocks]
+        return {
+            'keys': self.count,
+            'capacity': self.capacity,
+            'hashes': self.hashes,
+            'bits': bits,
+            'bytes': len(self.blocks) * self.blocks.itemsize,
+            'bits_per_key': bits / self.count if self.count else 0.0,
+            'estimated_false_positive_rate': sum(ratio ** self.hashes for ratio in fill) / len(fill),
+        }
+
+# Secondary index on title: B+ Tree keyed on (case-folded title, game_id) so equal titles stay distinct
+class TitleIndex:
+    def __init__(self, order=3):
+        self.tree = BPlusTree(order=order)
+
+    @staticmethod
+    def normalize(title):
+        return title.casefold()
+
+    def _key(self, game_id, title):
+        return (self.normalize(title), game_id)
+
+    def bulk_load(self, games):
+        # games: (game_id, title) pairs in any order
+        self.tree.bulk_load(sorted((self._key(game_id, title), title) for game_id, title in games))
+
+    def insert(self, game_id, title):
+        self.tree.insert(self._key(game_id, title), title)
+
+    def delete(self, game_id, title):
+        return self.tree.delete(self._key(game_id, title))
+
+    def search(self, title):
+        # Every (game_id, title) whose title matches ignoring case, ordered by game_id
+        return self.range_search(title, title)
+
+    def range_search(self, start_title, end_title, limit=None, after=None):
+        # Titles between start_title and end_title inclusive, in title order; after is the last
+        # (game_id, title) pair of the previous page
+        start_key = (self.normalize(start_title),)
+        end_key = (self.normalize(end_title), float('inf'))
+        after_key = self._key(*after) if after is not None else None
+        return [(key[1], title) for key, title in self.tree.iter_range(start_key, end_key, limit, after_key)]
+
+    def page(self, limit, after=None):
+        # The whole catalog sorted by title, limit entries at a time
+        if not len(self.tree):
+            return []
+        start_key = self.tree.first(1)[0][0]
+        end_key = self.tree.last(1)[0][0]
+        after_key = self._key(*after) if after is not None else None
+        return [(key[1], title) for key, title in self.tree.iter_range(start_key, end_key, limit, after_key)]
+
+# Title trie for autocomplete: every node caches its best completions, so a lookup only walks the prefix
+class TitleTrieNode:
+    __slots__ = ('children', 'game_ids', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.game_ids = None
+        self.top = []
+
+class TitleTrie:
+    def __init__(self, top_k=AUTOCOMPLETE_TOP_K):
+        self.root = TitleTrieNode()
+        self.top_k = top_k
+        self.titles = {}
+        self.lookups = {}
+
+    def _entry(self, game_id):
+        # Most looked-up first, then alphabetical
+        return (-self.lookups.get(game_id, 0), self.titles[game_id][0], game_id)
+
+    def _path(self, key, create=False):
+        node = self.root
+        path = [node]
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[char] = TitleTrieNode()
+            node = child
+            path.append(node)
+        return path
+
+    def _offer(self, node, entry):
+        top = [current for current in node.top if current[2] != entry[2]]
+        if len(top) < self.top_k or entry < top[-1]:
+            insort(top, entry)
+            del top[self.top_k:]
+        node.top = top
+
+    def _refresh(self, node):
+        candidates = [self._entry(game_id) for game_id in node.game_ids or ()]
+        for child in node.children.values():
+            candidates.extend(child.top)
+        node.top = heapq.nsmallest(self.top_k, candidates)
+
+    def build(self, games):
+        self.root = TitleTrieNode()
+        self.titles = {}
+        for game_id, title in games:
+            key = TitleIndex.normalize(title)
+            self.titles[game_id] = (key, title)
+            terminal = self._path(key, create=True)[-1]
+            if terminal.game_ids is None:
+                terminal.game_ids = set()
+            terminal.game_ids.add(game_id)
+        # Fill the caches children-first
+        order = [self.root]
+        for node in order:
+            order.extend(node.children.values())
+        for node in reversed(order):
+            self._refresh(node)
+
+    def insert(self, game_id, title):
+        key = TitleIndex.normalize(title)
+        self.titles[game_id] = (key, title)
+        path = self._path(key, create=True)
+        if path[-1].game_ids is None:
+            path[-1].game_ids = set()
+        path[-1].game_ids.add(game_id)
+        entry = self._entry(game_id)
+        for node in path:
+            self._offer(node, entry)
+
+    def delete(self, game_id):
+        if game_id not in self.titles:
+            return False
+        key = self.titles[game_id][0]
+        path = self._path(key)
+        path[-1].game_ids.discard(game_id)
+        del self.titles[game_id]
+        self.lookups.pop(game_id, None)
+        for depth in range(len(path) - 1, -1, -1):
+            node = path[depth]
+            if depth > 0 and not node.children and not node.game_ids:
+                del path[depth - 1].children[key[depth - 1]]
+            elif any(entry[2] == game_id for entry in node.top):
+                self._refresh(node)
+        return True
+
+    def update(self, game_id, title):
+        # Retitling keeps the game's lookup count
+        lookups = self.lookups.get(game_id, 0)
+        self.delete(game_id)
+        if lookups:
+            self.lookups[game_id] = lookups
+        self.insert(game_id, title)
+
+    def record_lookup(self, game_id):
+        # Counts only grow, so the game can only move up in each cache along its path
+        if game_id not in self.titles:
+            return
+        self.lookups[game_id] = self.lookups.get(game_id, 0) + 1
+        entry = self._entry(game_id)
+        for node in self._path(self.titles[game_id][0]):
+            self._offer(node, entry)
+
+    def complete(self, prefix, limit=None):
+        path = self._path(TitleIndex.normalize(prefix))
+        if path is None:
+            return []
+        return [(game_id, self.titles[game_id][1]) for _, _, game_id in path[-1].top[:limit]]
 
 # MongoDB Connection Setup
 class Database:
@@ -139,6 +2883,12 @@ class Database:
             self.games = self.db["games"]
             self.customers = self.db["customers"]
             self.admins = self.db["admins"]
+            # Ordered log of catalog writes, so index snapshots can catch up on what they missed
+            self.game_changes = self.db["game_changes"]
+            self.counters = self.db["counters"]
+            # Change sequence each snapshot directory was last saved at; the log is kept back to the oldest
+            self.snapshot_marks = self.db["snapshot_marks"]
+            self.game_changes.create_index("seq", unique=True)
             self._init_admin()
         except ConnectionFailure:
             print("Failed to connect to MongoDB. Ensure MongoDB is running.")
@@ -177,21 +2927,230 @@ class UserManager:
 
 # Game Management System with Hybrid Indexing
 class GameManagementSystem:
-    def __init__(self):
+    def __init__(self, bplus_order=3, compact_nodes=False, snapshot_dir=None, wal_group_commit_interval=0.05,
+                 ordered_engine='bplus', hash_engine='dict', paged_dir=None, paged_pool_pages=1024):
         self.db = Database()
         self.user_manager = UserManager(self.db)
-        self.bplus_tree = BPlusTree(order=3)
-        self.hash_index = HashIndex()
+        self.bplus_order = bplus_order
+        self.bplus_class = CompactBPlusTree if compact_nodes else BPlusTree
+        if ordered_engine not in ('bplus', 'lsm', 'learned', 'direct', 'sorted', 'eytzinger', 'paged'):
+            raise ValueError("ordered_engine must be 'bplus', 'lsm', 'learned', 'direct', 'sorted', 'eytzinger' or 'paged'")
+        self.ordered_engine = ordered_engine
+        # The paged engine's page file is private to this process and rebuilt on every start
+        self.paged_path = None
+        self.paged_pool_pages = paged_pool_pages
+        if ordered_engine == 'paged':
+            self.paged_path = os.path.join(tempfile.mkdtemp(prefix="gms-pages-", dir=paged_dir), "bplus_tree.pages")
+        if hash_engine not in HashIndex.ENGINES:
+            raise ValueError(f"hash_engine must be one of {', '.join(HashIndex.ENGINES)}")
+        self.hash_engine = hash_engine
+        self.snapshot_dir = snapshot_dir
         self.query_stats = {'equality': 0, 'range': 0}
+        self.hash_lookups = 0
+        self.hash_lookup_time = 0.0
         self.current_index = 'bplus'
-        self.load_games()
+        self.wal = None
+        if snapshot_dir is not None:
+            os.makedirs(snapshot_dir, exist_ok=True)
+            self.wal = IndexWAL(os.path.join(snapshot_dir, "index.wal"), wal_group_commit_interval)
+        self._reset_indexes()
+        if not self.load_snapshots():
+            self.load_games()
+            self.save_snapshots()
+
+    def _reset_indexes(self):
+        # The id-ordered index keeps the bplus_tree name whichever engine backs it
+        if self.ordered_engine == 'lsm':
+            self.bplus_tree = LSMIndex()
+        elif self.ordered_engine == 'learned':
+            self.bplus_tree = LearnedIndex()
+        elif self.ordered_engine == 'direct':
+            self.bplus_tree = DirectAddressIndex()
+        elif self.ordered_engine == 'sorted':
+            self.bplus_tree = SortedArrayIndex()
+        elif self.ordered_engine == 'eytzinger':
+            self.bplus_tree = EytzingerIndex()
+        elif self.ordered_engine == 'paged':
+            if isinstance(getattr(self, 'bplus_tree', None), PagedBPlusTree):
+                self.bplus_tree.close()
+            self.bplus_tree = PagedBPlusTree(self.paged_path, pool_pages=self.paged_pool_pages)
+        else:
+            self.bplus_tree = self.bplus_class(order=self.bplus_order)
+        self.hash_index = HashIndex(engine=self.hash_engine)
+        self.title_index = TitleIndex(order=self.bplus_order)
+        self.title_trie = TitleTrie()
+        self.id_filter = BloomFilter()
+        self.id_filter_deletes = 0
+        self.id_filter_rejects = 0
+        self.id_filter_false_positives = 0
+        self.applied_change_seq = 0
 
     def load_games(self):
-        for game in self.db.games.find():
-            game_id = game["game_id"]
-            title = game["title"]
-            self.bplus_tree.insert(game_id, title)
-            self.hash_index.insert(game_id, title)
+        # Changes logged from here on may race the scan; replaying them later is harmless
+        self.applied_change_seq = self._latest_change_seq()
+        cursor = self.db.games.find({}, {"_id": 0, "game_id": 1, "title": 1}).sort("game_id", 1)
+
+        titles = []
+
+        def sorted_games():
+            # games has no unique index on game_id; a repeated id keeps the last document's title
+            for game in cursor:
+                pair = (game["game_id"], game["title"])
+                if titles and titles[-1][0] == pair[0]:
+                    titles[-1] = pair
+                    continue
+                if titles:
+                    yield titles[-1]
+                titles.append(pair)
+            if titles:
+                yield titles[-1]
+
+        self.bplus_tree.bulk_load(sorted_games())
+        self.hash_index.bulk_load(titles)
+        self._load_secondary_indexes(titles)
+
+    def _load_secondary_indexes(self, games):
+        self.title_index.bulk_load(games)
+        self.title_trie.build(games)
+        self._rebuild_id_filter()
+
+    def _rebuild_id_filter(self):
+        # Sized for twice the catalog so adds have room before the next rebuild
+        game_ids = self.hash_index.index.keys()
+        self.id_filter = BloomFilter(capacity=max(1024, 2 * len(game_ids)))
+        for game_id in game_ids:
+            self.id_filter.add(game_id)
+        self.id_filter_deletes = 0
+
+    def _snapshot_paths(self):
+        return (os.path.join(self.snapshot_dir, "bplus_tree.snap"),
+                os.path.join(self.snapshot_dir, "hash_index.snap"))
+
+    def save_snapshots(self):
+        if self.snapshot_dir is None:
+            return False
+        bplus_path, hash_path = self._snapshot_paths()
+        # Catch up on other workers' writes first, or the mark and the WAL checkpoint stay stuck at the first gap
+        self.apply_changes()
+        # Register the mark before the files exist, so a concurrent prune cannot drop changes they will need
+        self.db.snapshot_marks.update_one(
+            {"_id": os.path.abspath(self.snapshot_dir)},
+            {"$set": {"seq": self.applied_change_seq}},
+            upsert=True
+        )
+        self.bplus_tree.save_snapshot(bplus_path, self.applied_change_seq)
+        self.hash_index.save_snapshot(hash_path, self.applied_change_seq)
+        self.wal.checkpoint(self.applied_change_seq)
+        self._prune_changes()
+        return True
+
+    def load_snapshots(self):
+        # Warm start: restore both id indexes from disk, replay the local WAL, then catch up on
+        # anything other processes logged to Mongo since
+        if self.snapshot_dir is None:
+            return False
+        bplus_path, hash_path = self._snapshot_paths()
+        if not (os.path.exists(bplus_path) and os.path.exists(hash_path)):
+            return False
+        try:
+            bplus_seq = self.bplus_tree.load_snapshot(bplus_path)
+            hash_seq = self.hash_index.load_snapshot(hash_path)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring index snapshot: {e}")
+            self._reset_indexes()
+            return False
+        if bplus_seq != hash_seq:
+            self._reset_indexes()
+            return False
+        self._load_secondary_indexes(list(self.bplus_tree.items()))
+        self.applied_change_seq = bplus_seq
+        self.replay_wal()
+        first_change = self.db.game_changes.find_one({"seq": {"$gt": self.applied_change_seq}}, sort=[("seq", 1)])
+        if first_change is not None and first_change["seq"] > self.applied_change_seq + 1:
+            # The log was trimmed past this snapshot, so it cannot catch up; rebuild from the games collection
+            self._reset_indexes()
+            return False
+        self.apply_changes()
+        return True
+
+    def _latest_change_seq(self):
+        counter = self.db.counters.find_one({"_id": "game_changes"})
+        return counter["seq"] if counter else 0
+
+    def _record_change(self, op, game_id, title=None):
+        counter = self.db.counters.find_one_and_update(
+            {"_id": "game_changes"},
+            {"$inc": {"seq": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        self.db.game_changes.insert_one({"seq": counter["seq"], "op": op, "game_id": game_id, "title": title})
+        if self.wal is not None:
+            wal_op = IndexWAL.OP_DELETE if op == "delete" else IndexWAL.OP_UPSERT
+            self.wal.append(counter["seq"], wal_op, game_id, title)
+        if not self._advance_change_seq(counter["seq"]):
+            # Another worker wrote since this process last caught up; pull its changes in now
+            self.apply_changes()
+        if counter["seq"] % CHANGE_LOG_PRUNE_INTERVAL == 0:
+            self._prune_changes()
+
+    def _prune_changes(self):
+        # Snapshot loads replay changes after their mark; with no marks registered, a cold start rebuilds
+        # from the games collection and nothing in the log is needed
+        oldest = self.db.snapshot_marks.find_one({}, sort=[("seq", 1)])
+        horizon = oldest["seq"] if oldest is not None else self._latest_change_seq()
+        self.db.game_changes.delete_many({"seq": {"$lte": horizon}})
+
+    def _advance_change_seq(self, seq):
+        # Only advance past changes this process has actually seen; gaps are replayed by apply_changes
+        if seq == self.applied_change_seq + 1:
+            self.applied_change_seq = seq
+            return True
+        return seq <= self.applied_change_seq
+
+    def replay_wal(self):
+        for lsn, op, game_id, title in self.wal.replay(self.applied_change_seq):
+            if op == IndexWAL.OP_DELETE:
+                self._index_delete(game_id)
+            else:
+                self._index_upsert(game_id, title)
+            self._advance_change_seq(lsn)
+
+    def apply_changes(self):
+        changes = self.db.game_changes.find({"seq": {"$gt": self.applied_change_seq}}).sort("seq", 1)
+        for change in changes:
+            if change["op"] == "delete":
+                self._index_delete(change["game_id"])
+            else:
+                self._index_upsert(change["game_id"], change["title"])
+            self.applied_change_seq = change["seq"]
+
+    def _index_upsert(self, game_id, title):
+        old_title = self.hash_index.search(game_id)
+        self.bplus_tree.upsert(game_id, title)
+        self.hash_index.upsert(game_id, title)
+        if old_title is not None:
+            self.title_index.delete(game_id, old_title)
+        else:
+            self.id_filter.add(game_id)
+            if self.id_filter.count > self.id_filter.capacity:
+                self._rebuild_id_filter()
+        self.title_index.insert(game_id, title)
+        self.title_trie.update(game_id, title)
+
+    def _index_delete(self, game_id):
+        old_title = self.hash_index.search(game_id)
+        if old_title is None:
+            return False
+        self.bplus_tree.delete(game_id)
+        self.hash_index.delete(game_id)
+        self.title_index.delete(game_id, old_title)
+        self.title_trie.delete(game_id)
+        # Bloom filters cannot forget keys; rebuild once stale entries would noticeably raise the false positive rate
+        self.id_filter_deletes += 1
+        if self.id_filter_deletes * 4 > self.id_filter.count:
+            self._rebuild_id_filter()
+        return True
 
     def add_game(self, game_id, title):
         if not session.get('is_admin'):
@@ -199,8 +3158,8 @@ class GameManagementSystem:
         if self.db.games.find_one({"game_id": game_id}):
             return False
         self.db.games.insert_one({"game_id": game_id, "title": title})
-        self.bplus_tree.insert(game_id, title)
-        self.hash_index.insert(game_id, title)
+        self._record_change("add", game_id, title)
+        self._index_upsert(game_id, title)
         return True
 
     def update_query_stats(self, query_type):
@@ -219,6 +3178,9 @@ class GameManagementSystem:
 
     def find_game(self, game_id, query_type='equality'):
         self.update_query_stats(query_type)
+        if not self.id_filter.might_contain(game_id):
+            self.id_filter_rejects += 1
+            return None, 0.0, 0.0
 
         start_time = time.time()
         bplus_result = self.bplus_tree.search(game_id)
@@ -227,23 +3189,106 @@ class GameManagementSystem:
         start_time = time.time()
         hash_result = self.hash_index.search(game_id)
         hash_time = time.time() - start_time
+        self.hash_lookups += 1
+        self.hash_lookup_time += hash_time
 
         result = hash_result if self.current_index == 'hash' else bplus_result
+        if result is not None:
+            self.title_trie.record_lookup(game_id)
+        else:
+            self.id_filter_false_positives += 1
         return result, bplus_time, hash_time
 
-    def range_search(self, start_id, end_id):
+    def find_games(self, game_ids):
+        # Batch lookup for cart and wishlist pages: (game_id, title) for each id that exists
+        self.update_query_stats('equality')
+        game_ids = [game_id for game_id in game_ids if self.id_filter.might_contain(game_id)]
+        index = self.hash_index if self.current_index == 'hash' else self.bplus_tree
+        titles = index.search_many(game_ids)
+        return [(game_id, title) for game_id, title in zip(game_ids, titles) if title is not None]
+
+    def id_filter_stats(self):
+        stats = self.id_filter.stats()
+        stats['stale_keys'] = self.id_filter_deletes
+        stats['rejected_lookups'] = self.id_filter_rejects
+        stats['false_positive_lookups'] = self.id_filter_false_positives
+        # Among lookups for ids that do not exist, the share the filter failed to stop
+        misses = self.id_filter_rejects + self.id_filter_false_positives
+        stats['observed_false_positive_rate'] = self.id_filter_false_positives / misses if misses else 0.0
+        return stats
+
+    def hash_memory_stats(self):
+        stats = self.hash_index.memory_stats()
+        stats['engine'] = self.hash_engine
+        return stats
+
+    def benchmark_hash_memory(self):
+        # Bytes per entry of every hash engine holding the current catalog; builds a full copy per engine
+        if not session.get('is_admin'):
+            return None
+        games = list(self.hash_index.index.items())
+        results = {}
+        for engine in HashIndex.ENGINES:
+            index = HashIndex(engine=engine)
+            index.bulk_load(games)
+            results[engine] = index.memory_stats()
+        return results
+
+    def ordered_index_stats(self):
+        stats = {'engine': self.ordered_engine}
+        if isinstance(self.bplus_tree, PagedBPlusTree):
+            stats['buffer_pool'] = self.bplus_tree.buffer_stats()
+        return stats
+
+    def hash_lookup_stats(self):
+        return {
+            'engine': self.hash_engine,
+            'lookups': self.hash_lookups,
+            'mean_lookup_seconds': self.hash_lookup_time / self.hash_lookups if self.hash_lookups else 0.0,
+        }
+
+    def autocomplete(self, prefix, limit=AUTOCOMPLETE_TOP_K):
+        return self.title_trie.complete(prefix, limit)
+
+    def find_games_by_title(self, title):
+        return self.title_index.search(title)
+
+    def title_range_search(self, start_title, end_title, limit=None, after=None):
+        return self.title_index.range_search(start_title, end_title, limit, after)
+
+    def titles_page(self, limit, after=None):
+        return self.title_index.page(limit, after)
+
+    def count_games(self, start_id, end_id):
+        return self.bplus_tree.count_range(start_id, end_id)
+
+    def catalog_page(self, page, page_size=50):
+        # One page of the whole catalog in game_id order plus the catalog size, for page jumps
+        total = len(self.bplus_tree)
+        offset = page * page_size
+        if page < 0 or offset >= total:
+            return [], total
+        first_id = self.bplus_tree.select(offset)[0]
+        last_id = self.bplus_tree.select(min(offset + page_size, total) - 1)[0]
+        return list(self.bplus_tree.iter_range(first_id, last_id)), total
+
+    def range_search(self, start_id, end_id, limit=None, after_id=None):
         self.update_query_stats('range')
 
         start_time = time.time()
-        bplus_results = self.bplus_tree.range_search(start_id, end_id)
+        bplus_results = list(self.bplus_tree.iter_range(start_id, end_id, limit, after_id))
         bplus_time = time.time() - start_time
 
         start_time = time.time()
-        hash_results = self.hash_index.range_search(start_id, end_id)
+        hash_results = list(self.hash_index.iter_range(start_id, end_id, limit, after_id))
         hash_time = time.time() - start_time
 
         return bplus_results, bplus_time, hash_results, hash_time
 
+    def newest_games(self, count=20):
+        # Highest game_ids first, reading only the rightmost leaves of the B+ Tree
+        return self.bplus_tree.last(count)
+
     def update_game(self, game_id, new_title):
         if not session.get('is_admin'):
             return False
@@ -252,8 +3297,8 @@ class GameManagementSystem:
             {"$set": {"title": new_title}}
         )
         if result.modified_count > 0:
-            self.bplus_tree.insert(game_id, new_title)
-            self.hash_index.insert(game_id, new_title)
+            self._record_change("update", game_id, new_title)
+            self._index_upsert(game_id, new_title)
         return result.modified_count > 0
 
     def delete_game(self, game_id):
@@ -261,9 +3306,8 @@ class GameManagementSystem:
             return False
         result = self.db.games.delete_one({"game_id": game_id})
         if result.deleted_count > 0:
-            self.bplus_tree = BPlusTree(order=3)
-            self.hash_index = HashIndex()
-            self.load_games()
+            self._record_change("delete", game_id)
+            self._index_delete(game_id)
         return result.deleted_count > 0
 
     def benchmark_workload(self, num_queries, query_type):
@@ -317,6 +3361,108 @@ class GameManagementSystem:
 
         return bplus_time, hash_time, self.current_index
 
+    def benchmark_ingest(self, num_keys):
+        # Random-order inserts/sec into a fresh order-N B+ Tree versus a fresh LSM index
+        if not session.get('is_admin'):
+            return None, None
+        keys = random.sample(range(num_keys * 10), num_keys)
+
+        start_time = time.time()
+        tree = BPlusTree(order=self.bplus_order)
+        for key in keys:
+            tree.insert(key, f"Game_{key}")
+        bplus_time = time.time() - start_time
+
+        start_time = time.time()
+        lsm = LSMIndex()
+        for key in keys:
+            lsm.insert(key, f"Game_{key}")
+        lsm.wait_for_merges()
+        lsm_time = time.time() - start_time
+
+        return num_keys / max(bplus_time, 1e-9), num_keys / max(lsm_time, 1e-9)
+
+    def benchmark_static(self, num_queries):
+        # Point and short range reads against the current catalog, order-3 B+ Tree versus the static engines
+        if not session.get('is_admin'):
+            return None
+        games = list(self.bplus_tree.items())
+        if not games:
+            return None
+        engines = [('B+ Tree (order 3)', BPlusTree(order=3)), ('Sorted array', SortedArrayIndex()),
+                   ('Eytzinger', EytzingerIndex())]
+        low, high = games[0][0], games[-1][0]
+        point_keys = [random.randint(low, high) for _ in range(num_queries)]
+        range_starts = [random.randint(low, high) for _ in range(num_queries)]
+
+        results = []
+        for name, engine in engines:
+            engine.bulk_load(games)
+            start_time = time.time()
+            for key in point_keys:
+                engine.search(key)
+            point_time = time.time() - start_time
+
+            start_time = time.time()
+            for start_id in range_starts:
+                list(engine.iter_range(start_id, start_id + 10))
+            range_time = time.time() - start_time
+            results.append((name, point_time, range_time))
+        return results
+
+    def benchmark_tail_latency(self, num_queries):
+        # Per-operation latency percentiles for each hash engine while the catalog is inserted one key at
+        # a time: a second thread issues the lookups, spread evenly over the inserts, so a lookup that
+        # waits on a resize shows up in its tail
+        if not session.get('is_admin'):
+            return None
+        if num_queries < 1:
+            raise ValueError("num_queries must be at least 1")
+        games = list(self.hash_index.index.items())
+        if not games:
+            return None
+        random.shuffle(games)
+        game_ids = [game_id for game_id, _ in games]
+        probe_ids = [random.randint(min(game_ids), max(game_ids) + len(game_ids) // 10) for _ in range(num_queries)]
+
+        def percentiles(latencies):
+            latencies.sort()
+            pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+            return {
+                'mean': sum(latencies) / len(latencies),
+                'p50': pick(0.5),
+                'p99': pick(0.99),
+                'p99.9': pick(0.999),
+                'max': latencies[-1],
+            }
+
+        def lookups(index, due, latencies):
+            for game_id in probe_ids:
+                due.acquire()
+                start_time = time.perf_counter()
+                index.search(game_id)
+                latencies.append(time.perf_counter() - start_time)
+
+        results = {}
+        for engine in HashIndex.ENGINES:
+            index = HashIndex(engine=engine)
+            insert_latencies, lookup_latencies = [], []
+            # One permit per lookup, released as the inserts reach its share of the catalog
+            due = threading.Semaphore(0)
+            reader = threading.Thread(target=lookups, args=(index, due, lookup_latencies), daemon=True)
+            reader.start()
+            released = 0
+            for i, (game_id, title) in enumerate(games, 1):
+                start_time = time.perf_counter()
+                index.insert(game_id, title)
+                insert_latencies.append(time.perf_counter() - start_time)
+                while released < i * num_queries // len(games):
+                    due.release()
+                    released += 1
+            reader.join()
+            results[engine] = {'insert': percentiles(insert_latencies), 'lookup': percentiles(lookup_latencies)}
+        return results
+
     def customer_signup(self, username, password):
         return self.user_manager.customer_signup(username, password)
 
@@ -334,7 +3480,16 @@ class GameManagementSystem:
             return True
         return False
 
-game_system = GameManagementSystem()
+game_system = GameManagementSystem(
+    bplus_order=int(os.environ.get("BPLUS_ORDER", 3)),
+    compact_nodes=os.environ.get("BPLUS_COMPACT") == "1",
+    snapshot_dir=os.environ.get("INDEX_SNAPSHOT_DIR"),
+    wal_group_commit_interval=float(os.environ.get("INDEX_WAL_GROUP_COMMIT", 0.05)),
+    ordered_engine=os.environ.get("ORDERED_INDEX_ENGINE", "bplus"),
+    hash_engine=os.environ.get("HASH_INDEX_ENGINE", "dict"),
+    paged_dir=os.environ.get("PAGED_INDEX_DIR"),
+    paged_pool_pages=int(os.environ.get("PAGED_POOL_PAGES", 1024)),
+)
 
 # Flask Routes
 @app.route('/')
@@ -404,10 +3559,13 @@ def customer_range_search():
         return redirect(url_for('customer_menu'))
     start_id = request.form['start_id']
     end_id = request.form['end_id']
+    after_id = request.form.get('after_id', '').strip()
     try:
         start_id = int(start_id)
         end_id = int(end_id)
-        bplus_results, bplus_time, hash_results, hash_time = game_system.range_search(start_id, end_id)
+        after_id = int(after_id) if after_id else None
+        bplus_results, bplus_time, hash_results, hash_time = game_system.range_search(
+            start_id, end_id, limit=RANGE_PAGE_SIZE, after_id=after_id)
         if bplus_results:
             flash("B+ Tree Range Search Results:", "success")
             for game_id, title in bplus_results:
@@ -423,10 +3581,62 @@ def customer_range_search():
             flash(f"Hash Index Range Search Time: {hash_time:.6f} seconds", "info")
         else:
             flash("No games found in range (Hash Index).", "error")
+
+        if len(bplus_results) == RANGE_PAGE_SIZE:
+            total = game_system.count_games(start_id, end_id)
+            shown_from = game_system.count_games(start_id, bplus_results[0][0] - 1) + 1
+            shown_to = shown_from + len(bplus_results) - 1
+            flash(f"Showing games {shown_from}-{shown_to} of {total}. Continue after Game {bplus_results[-1][0]} for the next page.", "info")
     except ValueError:
         flash("Invalid range. Please enter numbers.", "error")
     return redirect(url_for('customer_operations'))
 
+@app.route('/customer/title_search', methods=['POST'])
+def customer_title_search():
+    if not session.get('current_user') or session.get('is_admin'):
+        flash("Please log in as a customer.", "error")
+        return redirect(url_for('customer_menu'))
+    title = request.form['title'].strip()
+    results = game_system.find_games_by_title(title)
+    if results:
+        for game_id, game_title in results:
+            flash(f"Game {game_id}: {game_title}", "success")
+    else:
+        flash(f"No games titled '{title}'.", "error")
+    return redirect(url_for('customer_operations'))
+
+@app.route('/customer/title_range_search', methods=['POST'])
+def customer_title_range_search():
+    if not session.get('current_user') or session.get('is_admin'):
+        flash("Please log in as a customer.", "error")
+        return redirect(url_for('customer_menu'))
+    start_title = request.form['start_title'].strip()
+    end_title = request.form['end_title'].strip()
+    results = game_system.title_range_search(start_title, end_title, limit=RANGE_PAGE_SIZE)
+    if results:
+        flash("Title Range Search Results:", "success")
+        for game_id, title in results:
+            flash(f"Game {game_id}: {title}", "success")
+        if len(results) == RANGE_PAGE_SIZE:
+            flash(f"Showing the first {RANGE_PAGE_SIZE} titles. Narrow the range to see more.", "info")
+    else:
+        flash("No games found in title range.", "error")
+    return redirect(url_for('customer_operations'))
+
+@app.route('/customer/autocomplete')
+def customer_autocomplete():
+    if not session.get('current_user'):
+        return jsonify({"error": "Please log in."}), 401
+    prefix = request.args.get('q', '')
+    try:
+        limit = min(int(request.args.get('limit', AUTOCOMPLETE_TOP_K)), AUTOCOMPLETE_TOP_K)
+    except ValueError:
+        return jsonify({"error": "Invalid limit. Please enter a number."}), 400
+    if limit < 1:
+        return jsonify({"error": "Limit must be at least 1."}), 400
+    completions = game_system.autocomplete(prefix, limit)
+    return jsonify([{"game_id": game_id, "title": title} for game_id, title in completions])
+
 @app.route('/admin')
 def admin_menu():
     return render_template('admin_login.html')
@@ -492,10 +3702,13 @@ def admin_range_search():
         return redirect(url_for('main_menu'))
     start_id = request.form['start_id']
     end_id = request.form['end_id']
+    after_id = request.form.get('after_id', '').strip()
     try:
         start_id = int(start_id)
         end_id = int(end_id)
-        bplus_results, bplus_time, hash_results, hash_time = game_system.range_search(start_id, end_id)
+        after_id = int(after_id) if after_id else None
+        bplus_results, bplus_time, hash_results, hash_time = game_system.range_search(
+            start_id, end_id, limit=RANGE_PAGE_SIZE, after_id=after_id)
         if bplus_results:
             flash("B+ Tree Range Search Results:", "success")
             for game_id, title in bplus_results:
@@ -511,6 +3724,12 @@ def admin_range_search():
             flash(f"Hash Index Range Search Time: {hash_time:.6f} seconds", "info")
         else:
             flash("No games found in range (Hash Index).", "error")
+
+        if len(bplus_results) == RANGE_PAGE_SIZE:
+            total = game_system.count_games(start_id, end_id)
+            shown_from = game_system.count_games(start_id, bplus_results[0][0] - 1) + 1
+            shown_to = shown_from + len(bplus_results) - 1
+            flash(f"Showing games {shown_from}-{shown_to} of {total}. Continue after Game {bplus_results[-1][0]} for the next page.", "info")
     except ValueError:
         flash("Invalid range. Please enter numbers.", "error")
     return redirect(url_for('admin_operations'))
@@ -557,8 +3776,45 @@ def admin_benchmark():
     query_type = request.form['query_type']
     try:
         num_queries = int(num_queries)
+        if num_queries < 1:
+            flash("Number of queries must be at least 1.", "error")
+            return redirect(url_for('admin_operations'))
+        if query_type == 'ingest':
+            bplus_rate, lsm_rate = game_system.benchmark_ingest(num_queries)
+            flash(f"Ingest ({num_queries} random inserts):", "success")
+            flash(f"B+ Tree: {bplus_rate:,.0f} inserts/second", "info")
+            flash(f"LSM Index: {lsm_rate:,.0f} inserts/second", "info")
+            return redirect(url_for('admin_operations'))
+        if query_type == 'static':
+            results = game_system.benchmark_static(num_queries)
+            if results is None:
+                flash("No games loaded to benchmark.", "error")
+                return redirect(url_for('admin_operations'))
+            flash(f"Static engines ({num_queries} point lookups, {num_queries} ranges of 11 ids):", "success")
+            for name, point_time, range_time in results:
+                flash(f"{name}: point {point_time:.4f} seconds, range {range_time:.4f} seconds", "info")
+            return redirect(url_for('admin_operations'))
+        if query_type == 'memory':
+            results = game_system.benchmark_hash_memory()
+            flash("Hash engine memory per entry (titles excluded, bucket directory included):", "success")
+            for engine, stats in results.items():
+                flash(f"{engine}: {stats['bytes_per_key']:.1f} bytes "
+                      f"({stats['engine_bytes'] / max(stats['keys'], 1):.1f} engine + "
+                      f"{stats['directory_bytes'] / max(stats['keys'], 1):.1f} directory)", "info")
+            return redirect(url_for('admin_operations'))
+        if query_type == 'tail':
+            results = game_system.benchmark_tail_latency(num_queries)
+            if results is None:
+                flash("No games loaded to benchmark.", "error")
+                return redirect(url_for('admin_operations'))
+            flash(f"Hash engine latency in microseconds ({num_queries} lookups):", "success")
+            for engine, ops in results.items():
+                for op, stats in ops.items():
+                    summary = ", ".join(f"{name} {seconds * 1e6:.2f}" for name, seconds in stats.items())
+                    flash(f"{engine} {op}: {summary}", "info")
+            return redirect(url_for('admin_operations'))
         if query_type not in ['equality', 'range', 'mixed']:
-            flash("Invalid query type. Use 'equality', 'range', or 'mixed'.", "error")
+            flash("Invalid query type. Use 'equality', 'range', 'mixed', 'ingest', 'static', 'memory', or 'tail'.", "error")
             return redirect(url_for('admin_operations'))
         bplus_time, hash_time, current_index = game_system.benchmark_workload(num_queries, query_type)
         if bplus_time is not None:
@@ -572,6 +3828,28 @@ def admin_benchmark():
         flash("Invalid number of queries. Please enter a number.", "error")
     return redirect(url_for('admin_operations'))
 
+@app.route('/admin/snapshot', methods=['POST'])
+def admin_snapshot():
+    if not session.get('is_admin'):
+        flash("Unauthorized access.", "error")
+        return redirect(url_for('main_menu'))
+    if game_system.save_snapshots():
+        flash(f"Index snapshot saved at change {game_system.applied_change_seq}.", "success")
+    else:
+        flash("Index snapshots are disabled. Set INDEX_SNAPSHOT_DIR to enable them.", "error")
+    return redirect(url_for('admin_operations'))
+
+@app.route('/admin/index_stats')
+def admin_index_stats():
+    if not session.get('is_admin'):
+        return jsonify({"error": "Unauthorized access."}), 403
+    return jsonify({
+        "id_filter": game_system.id_filter_stats(),
+        "ordered_index": game_system.ordered_index_stats(),
+        "hash_index": game_system.hash_memory_stats(),
+        "hash_lookups": game_system.hash_lookup_stats(),
+    })
+
 @app.route('/logout')
 def logout():
     session.pop('current_user', None)